@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+"""play many headless games in parallel with scripted pilots"""
+
+import argparse
+import ast
+import asyncio
+import importlib
+import itertools
+import json
+import multiprocessing
+import random
+import statistics
+import time
+
+import core.loop as loop
+import settings
+from core.constants import HEADLESS_ROWS, HEADLESS_COLUMNS
+from core.headless import HeadlessCanvas
+from main import create_coroutines
+from state import coroutines, obstacles
+from utils import read_all_frames
+
+# ten minutes of game time
+BATCH_TICKS = 36000
+
+
+class IdlePilot:
+    """never touches the controls"""
+
+    def __init__(self, seed):
+        pass
+
+    def __call__(self, canvas):
+        return 0, 0, False
+
+
+class RandomPilot:
+    """keeps random direction for a while, shoots now and then"""
+
+    shooting = 0.1
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.direction = 0, 0
+        self.ticks_left = 0
+
+    def __call__(self, canvas):
+        if not self.ticks_left:
+            self.ticks_left = self.random.randint(5, 60)
+            self.direction = self.random.randint(-1, 1), self.random.randint(-1, 1)
+        self.ticks_left -= 1
+        return (*self.direction, self.random.random() < self.shooting)
+
+
+class GunnerPilot(RandomPilot):
+    """moves like random pilot, shoots on every tick"""
+
+    shooting = 1
+
+
+PILOTS = {"idle": IdlePilot, "random": RandomPilot, "gunner": GunnerPilot}
+
+
+def get_pilot(name):
+    """pilot class by short name or by `module:attribute` path"""
+    if name in PILOTS:
+        return PILOTS[name]
+    module, _, attribute = name.partition(":")
+    return getattr(importlib.import_module(module), attribute)
+
+
+async def _stop_on_crash(ship):
+    """cancel every task when the ship is destroyed, so the game ends"""
+    while not ship.destroyed:
+        await asyncio.sleep(0)
+    for task in list(coroutines.tasks):
+        task.cancel()
+
+
+def play_game(game):
+    """play one headless game described by dict, return dict of results"""
+    for name, value in game["settings"].items():
+        setattr(settings, name, value)
+    random.seed(game["seed"])
+    canvas = HeadlessCanvas(game["rows"], game["columns"])
+    pilot = get_pilot(game["pilot"])(game["seed"])
+    loop.clock.capped = False
+    spawned = obstacles.added
+    ship, timeline, projectiles = create_coroutines(canvas, pilot)
+    coroutines.spawn(_stop_on_crash(ship), "batch")
+    started = time.perf_counter()
+    try:
+        loop.run(canvas, coroutines, game["ticks"])
+    finally:
+        for task in list(coroutines.tasks):
+            task.cancel()
+    elapsed = time.perf_counter() - started
+    return dict(
+        game,
+        crashed=ship.destroyed,
+        year=timeline.year,
+        ticks=loop.clock.tick,
+        spawned=obstacles.added - spawned,
+        destroyed=projectiles.hits,
+        shots=projectiles.fired,
+        tick_cost=elapsed / max(loop.clock.tick, 1),
+    )
+
+
+def make_games(args):
+    """every combination of swept settings and pilots, `games` times each"""
+    names = list(args.settings)
+    games = []
+    for values in itertools.product(*args.settings.values()):
+        for pilot in args.pilots:
+            for number in range(args.games):
+                games.append(
+                    {
+                        "settings": dict(zip(names, values), DEBUG=False),
+                        "pilot": pilot,
+                        "seed": args.seed + number,
+                        "ticks": args.ticks,
+                        "rows": args.rows,
+                        "columns": args.columns,
+                    }
+                )
+    return games
+
+
+def aggregate(results):
+    """results of games grouped by settings and pilot"""
+    groups = {}
+    for result in results:
+        swept = {
+            name: value
+            for name, value in sorted(result["settings"].items())
+            if name != "DEBUG"
+        }
+        key = json.dumps(swept), result["pilot"]
+        groups.setdefault(key, []).append(result)
+
+    report = []
+    for (swept, pilot), group in sorted(groups.items()):
+        years = [result["year"] for result in group]
+        report.append(
+            {
+                "settings": json.loads(swept),
+                "pilot": pilot,
+                "games": len(group),
+                "crashed": sum(result["crashed"] for result in group),
+                "year_mean": statistics.mean(years),
+                "year_min": min(years),
+                "year_max": max(years),
+                **{
+                    f"{name}_mean": statistics.mean(result[name] for result in group)
+                    for name in ("spawned", "destroyed", "shots", "tick_cost")
+                },
+            }
+        )
+    return report
+
+
+def print_report(report):
+    """aggregate report as a table"""
+    print(
+        f"{'settings':<40} {'pilot':<8} {'games':>5} {'crashed':>7}"
+        f" {'year':>7} {'min':>5} {'max':>5}"
+        f" {'spawned':>8} {'destroyed':>9} {'shots':>8} {'µs/tick':>8}"
+    )
+    for line in report:
+        swept = " ".join(f"{name}={value}" for name, value in line["settings"].items())
+        print(
+            f"{swept or '-':<40} {line['pilot']:<8} {line['games']:>5}"
+            f" {line['crashed']:>7} {line['year_mean']:>7.1f}"
+            f" {line['year_min']:>5} {line['year_max']:>5}"
+            f" {line['spawned_mean']:>8.1f} {line['destroyed_mean']:>9.1f}"
+            f" {line['shots_mean']:>8.1f} {line['tick_cost_mean'] * 1e6:>8.1f}"
+        )
+
+
+def parse_setting(text):
+    """NAME=VALUE,VALUE,... into name and list of values"""
+    name, _, values = text.partition("=")
+    if not hasattr(settings, name) or not values:
+        raise argparse.ArgumentTypeError(f"unknown setting or no values: {text}")
+    return name, [ast.literal_eval(value) for value in values.split(",")]
+
+
+def parse_args():
+    """command line arguments"""
+    parser = argparse.ArgumentParser(description="Spaceship batch simulator")
+    parser.add_argument("--games", type=int, default=8, help="games per combination")
+    parser.add_argument(
+        "--ticks", type=int, default=BATCH_TICKS, help="longest game in ticks"
+    )
+    parser.add_argument("--rows", type=int, default=HEADLESS_ROWS)
+    parser.add_argument("--columns", type=int, default=HEADLESS_COLUMNS)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument(
+        "--pilot",
+        dest="pilots",
+        action="append",
+        help=f"{', '.join(PILOTS)} or module:attribute, may be repeated",
+    )
+    parser.add_argument(
+        "--set",
+        dest="settings",
+        action="append",
+        type=parse_setting,
+        default=[],
+        metavar="NAME=VALUE,...",
+        help="sweep setting over values, may be repeated",
+    )
+    parser.add_argument("--processes", type=int, help="worker processes, all cores")
+    parser.add_argument("--json", metavar="FILE", help="save report into file")
+    args = parser.parse_args()
+    args.pilots = args.pilots or ["random"]
+    args.settings = dict(args.settings)
+    return args
+
+
+def main():
+    """play the games, print aggregate report"""
+    args = parse_args()
+    read_all_frames()  # compile frames bundle once for every worker
+    games = make_games(args)
+    # fresh process for every game, game state lives in module globals
+    with multiprocessing.Pool(args.processes, maxtasksperchild=1) as pool:
+        results = list(pool.imap_unordered(play_game, games))
+    report = aggregate(results)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f_d:
+            json.dump(report, f_d, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+"""benchmarks of the game loop and rendering hot paths"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+import timeit
+
+import core.loop as loop
+from core.animations import Explosion
+from core.constants import BASE_DIR, STARS
+from core.geometry import Geometry
+from core.physics import update_speed
+from curses_tools import draw_frame
+from objects.frame import Frame
+from objects.garbage import Garbage
+from core.registry import ObstacleRegistry
+from core.spatial import Grid
+from objects.obstacles import has_collision
+from objects.projectiles import Projectiles
+from objects.stars import Starfield
+from state import obstacles as registry
+from utils import read_all_frames
+
+
+class RecordingCanvas:
+    """stand-in canvas, counts calls and renders nothing"""
+
+    def __init__(self, rows=50, columns=200):
+        self.rows = rows
+        self.columns = columns
+        self.geometry = Geometry(rows, columns)
+        self.calls = 0
+
+    def getmaxyx(self):
+        """size of the canvas"""
+        return self.rows, self.columns
+
+    def addstr(self, row, column, text, attr=0):
+        """count call"""
+        self.calls += 1
+
+    def addch(self, row, column, symbol, attr=0):
+        """count call"""
+        self.calls += 1
+
+    def border(self):
+        """count call"""
+        self.calls += 1
+
+    def refresh(self):
+        """count call"""
+        self.calls += 1
+
+    def getch(self):
+        """no keys pressed"""
+        return -1
+
+    def nodelay(self, flag):
+        """input is never blocking here"""
+
+
+def report_call(name, func, number):
+    """print average duration of func call"""
+    seconds = timeit.timeit(func, number=number)
+    print(f"{name:<40} {seconds / number * 1e6:10.2f} µs/call")
+
+
+def bench_draw_frame(number):
+    """draw every frame asset, text and precompiled runs"""
+    canvas = RecordingCanvas()
+    for directory, _, filenames in sorted(os.walk(os.path.join(BASE_DIR, "frames"))):
+        for filename in sorted(filenames):
+            path = os.path.join(directory, filename)
+            with open(path) as f_d:
+                text = f_d.read()
+            name = os.path.relpath(path, os.path.join(BASE_DIR, "frames"))
+            frame = Frame(canvas, text, 5, 5)
+            report_call(
+                f"draw_frame {name}", lambda: draw_frame(canvas, 5, 5, text), number
+            )
+            report_call(f"Frame.show {name}", frame.show, number)
+
+
+def bench_collisions(number):
+    """box collision helpers"""
+    random.seed(0)
+    obstacles = ObstacleRegistry(Grid())
+    for _ in range(50):
+        obstacles.add(random.uniform(0, 50), random.randint(0, 200), 5, 10)
+    report_call(
+        "has_collision", lambda: has_collision((10, 10), (2, 3), (11, 11)), number
+    )
+    report_call(
+        "ObstacleRegistry.find_collision, point",
+        lambda: obstacles.find_collision(11, 11),
+        number,
+    )
+    report_call(
+        "ObstacleRegistry.find_collision, box",
+        lambda: obstacles.find_collision(11, 11, 5, 5),
+        number,
+    )
+    masks = (0b101010101, 0b10101010) * 2 + (0b101010101,)
+    report_call(
+        "ObstacleRegistry.find_collision, masks",
+        lambda: obstacles.find_collision(11, 11, 5, 9, masks),
+        number,
+    )
+
+
+def bench_physics(number):
+    """ship inertia with and without validation"""
+    report_call("physics.update_speed", lambda: update_speed(1.2, -0.5, 1, -1), number)
+    report_call(
+        "physics.update_speed, no validation",
+        lambda: update_speed(1.2, -0.5, 1, -1, validate=False),
+        number,
+    )
+
+
+async def keep_bullets(projectiles, count, rows, columns):
+    """refill shots which left the canvas"""
+    while True:
+        while len(projectiles) < count:
+            projectiles.fire(rows - 2, random.randint(1, columns - 2))
+        await asyncio.sleep(0)
+
+
+def bench_loop(stars, obstacles, bullets, ticks):
+    """full loop ticks with the given population"""
+    random.seed(0)
+    canvas = RecordingCanvas()
+    rows, columns = canvas.getmaxyx()
+    frames = read_all_frames()
+    garbage_frames = [Frame(canvas, text, None, None) for text in frames["garbage"]]
+    explosion = Explosion(canvas, frames["explosion"])
+    queue = loop.RunQueue()
+
+    starfield = Starfield(canvas)
+    for _ in range(stars):
+        row, column = random.randint(1, rows - 2), random.randint(1, columns - 2)
+        starfield.add_star(row, column, random.choice(STARS), random.random())
+    queue.spawn(starfield.run())
+
+    for _ in range(obstacles):
+        frame = random.choice(garbage_frames)
+        row = random.randint(0, rows - frame.rows_size - 1)
+        column = random.randint(1, columns - frame.columns_size - 1)
+        index = registry.add(row, column, *frame.size)
+        garbage = Garbage(canvas, index, row, column, frame, explosion)
+        queue.spawn(garbage.fly(speed=0))
+
+    projectiles = Projectiles(canvas)
+    projectiles.start(queue)
+    queue.spawn(keep_bullets(projectiles, bullets, rows, columns))
+
+    loop.clock.capped = False
+    started = time.perf_counter()
+    loop.run(canvas, queue, ticks)
+    elapsed = time.perf_counter() - started
+
+    for task in list(queue.tasks):
+        task.cancel()
+    for index in list(registry):
+        registry.remove(index)
+    print(
+        f"loop stars={stars:<4} obstacles={obstacles:<4} bullets={bullets:<4}"
+        f" {ticks / elapsed:10.1f} ticks/sec"
+        f" {elapsed / ticks * 1e6:10.2f} µs/tick"
+    )
+
+
+def parse_args():
+    """command line arguments"""
+    parser = argparse.ArgumentParser(description="Spaceship benchmarks")
+    parser.add_argument(
+        "--number", type=int, default=10000, help="calls per micro benchmark"
+    )
+    parser.add_argument("--ticks", type=int, default=600, help="ticks per loop run")
+    parser.add_argument("--stars", type=int, nargs="+", default=[0, 100, 400])
+    parser.add_argument("--obstacles", type=int, nargs="+", default=[0, 20, 80])
+    parser.add_argument("--bullets", type=int, nargs="+", default=[0, 50, 200])
+    return parser.parse_args()
+
+
+def main():
+    """run every benchmark"""
+    args = parse_args()
+    bench_draw_frame(args.number // 10)
+    bench_collisions(args.number)
+    bench_physics(args.number)
+    for stars in args.stars:
+        for obstacles in args.obstacles:
+            for bullets in args.bullets:
+                bench_loop(stars, obstacles, bullets, args.ticks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""packed bundle of precompiled frames"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+from array import array
+
+from objects.frame import Sprite, get_row_masks
+from .constants import (
+    BASE_DIR,
+    BUNDLE_PATH,
+    SPACESHIP_FRAMES_DIR,
+    EXPLOSION_FRAMES_DIR,
+    GARBAGE_FRAMES_DIR,
+)
+
+# magic, format version, index length
+_HEADER = struct.Struct("<4sBI")
+_MAGIC = b"SPFB"
+_VERSION = 1
+
+_GROUPS = {
+    "spaceship": SPACESHIP_FRAMES_DIR,
+    "explosion": EXPLOSION_FRAMES_DIR,
+    "garbage": GARBAGE_FRAMES_DIR,
+}
+_GAMEOVER_PATH = os.path.join(BASE_DIR, "frames", "gameover.txt")
+
+
+class BundledSprite:
+    """sprite stored in the bundle, text, runs and masks are decoded
+    on first use"""
+
+    __slots__ = (
+        "data",
+        "offset",
+        "text_length",
+        "runs_count",
+        "rows_size",
+        "columns_size",
+        "_text",
+        "_runs",
+        "_masks",
+    )
+
+    def __init__(self, data, offset, text_length, runs_count, rows_size, columns_size):
+        self.data = data
+        self.offset = offset
+        self.text_length = text_length
+        self.runs_count = runs_count
+        self.rows_size = rows_size
+        self.columns_size = columns_size
+        self._text = None
+        self._runs = None
+        self._masks = None
+
+    @property
+    def text(self):
+        """frame text"""
+        if self._text is None:
+            text = slice(self.offset, self.offset + self.text_length)
+            self._text = bytes(self.data[text]).decode()
+        return self._text
+
+    @property
+    def runs(self):
+        """runs of glyphs, same as `get_frame_runs` returns"""
+        if self._runs is None:
+            start = self.offset + self.text_length
+            numbers = array("H")
+            numbers.frombytes(self.data[slice(start, start + 6 * self.runs_count)])
+            lines = self.text.splitlines()
+            self._runs = [
+                (row, column, lines[row][slice(column, column + length)])
+                for row, column, length in zip(
+                    numbers[0::3], numbers[1::3], numbers[2::3]
+                )
+            ]
+        return self._runs
+
+    @property
+    def masks(self):
+        """masks of occupied cells, same as `get_row_masks` returns"""
+        if self._masks is None:
+            self._masks = get_row_masks(self.runs, self.rows_size)
+        return self._masks
+
+
+def _source_files():
+    """group name and sorted list of frame files of every group"""
+    sources = {
+        group: [
+            os.path.join(directory, filename)
+            for filename in sorted(os.listdir(directory))
+        ]
+        for group, directory in _GROUPS.items()
+    }
+    sources["gameover"] = [_GAMEOVER_PATH]
+    return sources
+
+
+def _fingerprint(sources):
+    """paths, modification times and sizes of source files"""
+    fingerprint = []
+    for paths in sources.values():
+        for path in paths:
+            stat = os.stat(path)
+            name = os.path.relpath(path, BASE_DIR)
+            fingerprint.append([name, stat.st_mtime_ns, stat.st_size])
+    return fingerprint
+
+
+def _read_sprites(sources):
+    """read and compile frame files"""
+    sprites = {}
+    for group, paths in sources.items():
+        sprites[group] = []
+        for path in paths:
+            with open(path) as f_d:
+                sprites[group].append(Sprite(f_d.read()))
+    return sprites
+
+
+def compile_bundle(sources, fingerprint, path=BUNDLE_PATH):
+    """read and compile frame files, pack them into the bundle file"""
+    index = {"fingerprint": fingerprint, "groups": {}}
+    data = bytearray()
+    for group, sprites in _read_sprites(sources).items():
+        entries = index["groups"][group] = []
+        for sprite in sprites:
+            text = sprite.text.encode()
+            numbers = array("H")
+            for row, column, run in sprite.runs:
+                numbers.extend((row, column, len(run)))
+            entries.append(
+                [
+                    len(data),
+                    len(text),
+                    len(sprite.runs),
+                    sprite.rows_size,
+                    sprite.columns_size,
+                ]
+            )
+            data += text
+            data += numbers.tobytes()
+
+    index_data = json.dumps(index).encode()
+    temporary_path = f"{path}.{os.getpid()}"
+    with open(temporary_path, "wb") as f_d:
+        f_d.write(_HEADER.pack(_MAGIC, _VERSION, len(index_data)))
+        f_d.write(index_data)
+        f_d.write(data)
+    os.replace(temporary_path, path)
+
+
+def _open_bundle(path):
+    """map the bundle into memory, return index and frames data"""
+    with open(path, "rb") as f_d:
+        data = mmap.mmap(f_d.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, index_length = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{path} is not a frames bundle of version {_VERSION}")
+    index_start = _HEADER.size
+    index_end = index_start + index_length
+    index = json.loads(data[index_start:index_end].decode())
+    return index, memoryview(data)[index_end:]
+
+
+def load_frames(path=BUNDLE_PATH):
+    """frames from the bundle, rebuild it first if frame files changed
+
+    returns dict of lists of sprites by group name, except "gameover"
+    which is a single sprite
+    """
+    sources = _source_files()
+    fingerprint = _fingerprint(sources)
+    try:
+        index, data = _open_bundle(path)
+    except (OSError, ValueError, struct.error):
+        index = data = None
+
+    if index is None or index["fingerprint"] != fingerprint:
+        logging.info("compile frames bundle %s", path)
+        try:
+            compile_bundle(sources, fingerprint, path)
+            index, data = _open_bundle(path)
+        except OSError:
+            logging.warning("could not write frames bundle %s", path)
+            frames = _read_sprites(sources)
+            frames["gameover"] = frames["gameover"][0]
+            return frames
+
+    frames = {
+        group: [BundledSprite(data, *entry) for entry in entries]
+        for group, entries in index["groups"].items()
+    }
+    frames["gameover"] = frames["gameover"][0]
+    return frames
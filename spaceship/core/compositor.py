@@ -0,0 +1,126 @@
+"""double buffered canvas"""
+
+from array import array
+
+from .geometry import Geometry
+
+
+class Compositor:
+    """canvas which collects drawing into the back buffer
+
+    game objects draw into it exactly as into a curses window. On refresh
+    the back buffer is compared with the front one, which mirrors the
+    screen, and only changed cells are written into the window. So drawing
+    and erasing the same cell during one tick costs nothing. On resize
+    buffers and the window are cleared, objects draw themselves again.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.rows, self.columns = window.getmaxyx()
+        self.geometry = Geometry(self.rows, self.columns)
+        self.geometry.subscribe(self._resize)
+        self.back = self._blank()
+        self.front = self._blank()
+        self.dirty = {}
+        self.with_border = False
+
+    def update_size(self):
+        """read window size after the terminal is resized"""
+        self.geometry.resize(*self.window.getmaxyx())
+
+    def _resize(self, rows, columns):
+        self.rows, self.columns = rows, columns
+        self.back = self._blank()
+        self.front = self._blank()
+        self.dirty.clear()
+        self.window.erase()
+
+    def _blank(self):
+        """buffer rows, every row is a pair (symbols, attributes)"""
+        return [
+            ([" "] * self.columns, array("L", (0,)) * self.columns)
+            for _ in range(self.rows)
+        ]
+
+    def getmaxyx(self):
+        """size of the canvas"""
+        return self.rows, self.columns
+
+    def addstr(self, row, column, text, attr=0):
+        """write text into the back buffer, clip it by canvas borders"""
+        if not 0 <= row < self.rows:
+            return
+        if column < 0:
+            text = text[-column:]
+            column = 0
+        end = min(column + len(text), self.columns)
+        if end <= column:
+            return
+        symbols, attributes = self.back[row]
+        symbols[column:end] = text[: end - column]
+        attributes[column:end] = array("L", (attr,)) * (end - column)
+
+        span = self.dirty.get(row)
+        if span is None:
+            self.dirty[row] = [column, end]
+        else:
+            span[0], span[1] = min(span[0], column), max(span[1], end)
+
+    def addch(self, row, column, symbol, attr=0):
+        """write single symbol into the back buffer"""
+        self.addstr(row, column, symbol, attr)
+
+    def border(self):
+        """keep window border on top of the buffer"""
+        self.with_border = True
+
+    def getch(self):
+        """read key from the window"""
+        return self.window.getch()
+
+    def nodelay(self, flag):
+        """switch window input mode"""
+        self.window.nodelay(flag)
+
+    def refresh(self):
+        """write changed cells into the window and refresh it"""
+        for row, (start, end) in self.dirty.items():
+            self._flush_row(row, start, end)
+        self.dirty.clear()
+        if self.with_border:
+            self.window.border()
+        self.window.refresh()
+
+    def _flush_row(self, row, start, end):
+        back_symbols, back_attributes = self.back[row]
+        front_symbols, front_attributes = self.front[row]
+        if row == self.rows - 1:
+            # curses can't write into the lower right corner
+            end = min(end, self.columns - 1)
+
+        column = start
+        while column < end:
+            if (
+                back_symbols[column] == front_symbols[column]
+                and back_attributes[column] == front_attributes[column]
+            ):
+                column += 1
+                continue
+            attr = back_attributes[column]
+            run_start = column
+            column += 1
+            while (
+                column < end
+                and back_attributes[column] == attr
+                and (
+                    back_symbols[column] != front_symbols[column]
+                    or front_attributes[column] != attr
+                )
+            ):
+                column += 1
+            self.window.addstr(
+                row, run_start, "".join(back_symbols[run_start:column]), attr
+            )
+            front_symbols[run_start:column] = back_symbols[run_start:column]
+            front_attributes[run_start:column] = back_attributes[run_start:column]
@@ -1,10 +1,34 @@
 """project global constants"""
 
+import curses
 import os
 
 # event loop frequency ~60hz
 TIC_TIMEOUT = 1 / 60
 
+# how many late ticks the loop runs back to back before dropping them
+MAX_CATCHUP_TICKS = 5
+
+# part of the tick canvas refreshes may take on average, and the longest
+# run of ticks without refresh, 60hz / 4 = 15 frames per second at worst
+RENDER_BUDGET = 0.5
+RENDER_MAX_INTERVAL = 4
+
+# load governor: part of the tick the whole tick may take, pressure rises
+# above it and drops below `GOVERNOR_RELIEF` of it, checked once per interval
+GOVERNOR_BUDGET = 0.8
+GOVERNOR_RELIEF = 0.5
+GOVERNOR_INTERVAL_TICKS = 30
+GOVERNOR_MAX_PRESSURE = 4
+# pressure levels shedding load: stars stop blinking, explosions skip every
+# other frame, then every level halves the live obstacles cap
+STARS_SHED_PRESSURE = 1
+EXPLOSION_SHED_PRESSURE = 2
+SPAWN_SHED_PRESSURE = 3
+
+# weight of the latest sample in loop statistics moving averages
+STATS_SMOOTHING = 0.05
+
 # project root directory
 BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
 
@@ -13,5 +37,44 @@ SPACESHIP_FRAMES_DIR = os.path.join(BASE_DIR, "frames", "spaceship")
 EXPLOSION_FRAMES_DIR = os.path.join(BASE_DIR, "frames", "explosion")
 GARBAGE_FRAMES_DIR = os.path.join(BASE_DIR, "frames", "obstacles")
 
+# precompiled frames, rebuilt when frame files change
+BUNDLE_PATH = os.path.join(BASE_DIR, "frames.bundle")
+
+# headless canvas default size
+HEADLESS_ROWS = 40
+HEADLESS_COLUMNS = 160
+HEADLESS_TICKS = 3600
+
+# periodic debug messages are written once per second
+LOG_INTERVAL_TICKS = 60
+
+# obstacles spatial index cell size
+GRID_CELL_ROWS = 8
+GRID_CELL_COLUMNS = 16
+
+# how many destroyed garbage instances are kept for reuse
+GARBAGE_POOL_SIZE = 64
+
+# profiler histogram buckets, the last one is for resumes longer than 2 ** 15 µs
+PROFILER_BUCKETS = 16
+# how many latest resumes the profiler keeps for the trace file
+PROFILER_TRACE_EVENTS = 200000
+# how many most expensive kinds of tasks the overlay shows
+PROFILER_OVERLAY_LINES = 10
+
 # stars symbols
 STARS = "+*.:"
+
+# blinking star stages, attribute and duration in seconds
+STARS_BLINK = (
+    (curses.A_DIM, 2),
+    (curses.A_NORMAL, 0.3),
+    (curses.A_BOLD, 0.5),
+    (curses.A_NORMAL, 0.3),
+)
+# slots of the starfield timing wheel, more than the longest stage in ticks
+STARS_WHEEL_SIZE = 128
+# parallax layers stars symbol, canvas cells per star, ticks per row of scroll
+PARALLAX_SYMBOL = "."
+PARALLAX_DENSITY = 150
+PARALLAX_PERIOD = 90
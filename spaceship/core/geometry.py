@@ -0,0 +1,37 @@
+"""cached canvas size"""
+
+
+class Geometry:
+    """size of the canvas, subscribers are told when it changes
+
+    hot paths read plain `rows` and `columns` instead of asking the window
+    on every call. The terminal game learns about resize from SIGWINCH the
+    input selector watches. Without the selector, as while recording,
+    ncurses turns SIGWINCH into `KEY_RESIZE` key, headless canvas sends
+    that key after resize too.
+    """
+
+    __slots__ = ("rows", "columns", "subscribers")
+
+    def __init__(self, rows, columns):
+        self.rows = rows
+        self.columns = columns
+        self.subscribers = []
+
+    def subscribe(self, callback):
+        """call `callback(rows, columns)` after every resize"""
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        """stop telling `callback` about resizes"""
+        self.subscribers.remove(callback)
+
+    def resize(self, rows, columns):
+        """update size, notify subscribers, return False if nothing changed"""
+        if (rows, columns) == (self.rows, self.columns):
+            return False
+        self.rows, self.columns = rows, columns
+        for callback in list(self.subscribers):
+            callback(rows, columns)
+        return True
@@ -0,0 +1,86 @@
+"""load governor of the game loop"""
+
+from .constants import (
+    GOVERNOR_BUDGET,
+    GOVERNOR_RELIEF,
+    GOVERNOR_INTERVAL_TICKS,
+    GOVERNOR_MAX_PRESSURE,
+    SPAWN_SHED_PRESSURE,
+)
+from .logs import Sampler
+
+
+class Governor:
+    """pressure level from the measured tick cost and the spawn limits
+
+    pressure rises by one level per `interval` ticks while the smoothed
+    tick cost is above `budget` part of the tick and drops by one while it
+    is below `relief` part of the budget. Consumers shed their load by the
+    level: cosmetic first, obstacles cap from `SPAWN_SHED_PRESSURE` on.
+
+    Measured time differs from run to run, so pressure only rises when
+    the governor is `adaptive`. It's off for headless, recorded and
+    replayed games, there the limits depend on the game state alone.
+    """
+
+    def __init__(
+        self,
+        budget=GOVERNOR_BUDGET,
+        relief=GOVERNOR_RELIEF,
+        interval=GOVERNOR_INTERVAL_TICKS,
+        max_pressure=GOVERNOR_MAX_PRESSURE,
+        adaptive=False,
+    ):
+        self.budget = budget
+        self.relief = relief
+        self.max_pressure = max_pressure
+        self.adaptive = adaptive
+        self.pressure = 0
+        self.peak_pressure = 0
+        self.throttled = 0
+        self.spawn_cap = None
+        self._sampler = Sampler(interval)
+
+    def start(self):
+        """reset level and counters"""
+        self.pressure = self.peak_pressure = self.throttled = 0
+        self.spawn_cap = None
+        self._sampler.next_tick = 0
+
+    def update(self, clock):
+        """move pressure one level towards the measured load"""
+        if not self._sampler(clock.tick):
+            return
+        if not self.adaptive:
+            self.pressure = 0
+            return
+        load = clock.tick_cost / (clock.tick_timeout * self.budget)
+        if load > 1 and self.pressure < self.max_pressure:
+            self.pressure += 1
+        elif load < self.relief and self.pressure:
+            self.pressure -= 1
+        self.peak_pressure = max(self.peak_pressure, self.pressure)
+
+    def cap(self, max_obstacles):
+        """live obstacles limit at the current pressure"""
+        shed = self.pressure - SPAWN_SHED_PRESSURE + 1
+        if shed <= 0:
+            return max_obstacles
+        return max(max_obstacles >> shed, 1)
+
+    def may_spawn(self, live, max_obstacles):
+        """whether one more obstacle fits under the cap"""
+        self.spawn_cap = self.cap(max_obstacles)
+        if live < self.spawn_cap:
+            return True
+        self.throttled += 1
+        return False
+
+    def stats(self):
+        """snapshot of level and counters"""
+        return {
+            "pressure": self.pressure,
+            "peak_pressure": self.peak_pressure,
+            "spawn_cap": self.spawn_cap,
+            "throttled": self.throttled,
+        }
@@ -0,0 +1,118 @@
+"""in-memory canvas for running the game without a terminal"""
+
+import curses
+from array import array
+
+from .constants import HEADLESS_ROWS, HEADLESS_COLUMNS
+from .geometry import Geometry
+
+
+class HeadlessCanvas:
+    """canvas implementing the subset of curses window API used by the game
+
+    cells are kept in two flat arrays, symbol codes and attributes. Writes
+    outside of the canvas raise `curses.error` like a real window does.
+    `keys` is a sequence of per tick key codes batches: `getch` returns
+    codes of the current batch, `refresh` moves to the next one. After
+    `resize` the next `getch` returns `KEY_RESIZE` like ncurses does, so a
+    compositor wrapping the canvas follows the new size.
+    """
+
+    def __init__(self, rows=HEADLESS_ROWS, columns=HEADLESS_COLUMNS, keys=()):
+        self.geometry = Geometry(rows, columns)
+        self.geometry.subscribe(self._clear)
+        self._clear(rows, columns)
+        self.keys = iter(keys)
+        self.pending_keys = []
+        self.refreshes = 0
+        self.resized = False
+        self._next_keys()
+
+    def _clear(self, rows, columns):
+        self.rows = rows
+        self.columns = columns
+        self.symbols = array("L", (ord(" "),)) * (rows * columns)
+        self.attributes = array("L", (0,)) * (rows * columns)
+
+    def resize(self, rows, columns):
+        """change size like terminal resize does, the canvas is cleared"""
+        self.geometry.resize(rows, columns)
+        self.resized = True
+
+    def _next_keys(self):
+        self.pending_keys = list(next(self.keys, ()))
+        self.pending_keys.reverse()
+
+    def getmaxyx(self):
+        """size of the canvas"""
+        return self.rows, self.columns
+
+    def addstr(self, row, column, text, attr=0):
+        """write text, the whole of it must fit into the row"""
+        if not (0 <= row < self.rows and 0 <= column):
+            raise curses.error(f"addstr out of canvas: {row}, {column}")
+        end = column + len(text)
+        if end > self.columns or (row == self.rows - 1 and end == self.columns):
+            raise curses.error(f"addstr out of canvas: {row}, {end}")
+        start = row * self.columns + column
+        cells = slice(start, start + len(text))
+        self.symbols[cells] = array("L", map(ord, text))
+        self.attributes[cells] = array("L", (attr,)) * len(text)
+
+    def addch(self, row, column, symbol, attr=0):
+        """write single symbol"""
+        self.addstr(row, column, symbol, attr)
+
+    def border(self):
+        """draw border along canvas edges"""
+        last_row, last_column = self.rows - 1, self.columns - 1
+        for row in range(1, last_row):
+            self._put(row, 0, "|")
+            self._put(row, last_column, "|")
+        for column in range(1, last_column):
+            self._put(0, column, "-")
+            self._put(last_row, column, "-")
+        for row in (0, last_row):
+            for column in (0, last_column):
+                self._put(row, column, "+")
+
+    def erase(self):
+        """clear every cell"""
+        self._clear(self.rows, self.columns)
+
+    def _put(self, row, column, symbol):
+        index = row * self.columns + column
+        self.symbols[index] = ord(symbol)
+        self.attributes[index] = 0
+
+    def refresh(self):
+        """count frames and switch to the next batch of scripted keys"""
+        self.refreshes += 1
+        self._next_keys()
+
+    def getch(self):
+        """next scripted key code of the current tick or -1"""
+        if self.resized:
+            self.resized = False
+            return curses.KEY_RESIZE
+        if self.pending_keys:
+            return self.pending_keys.pop()
+        return -1
+
+    def nodelay(self, flag):
+        """input is never blocking here"""
+
+    def cell(self, row, column):
+        """pair (symbol, attributes) of the cell"""
+        index = row * self.columns + column
+        return chr(self.symbols[index]), self.attributes[index]
+
+    def dump(self):
+        """canvas content as list of lines"""
+        text = "".join(map(chr, self.symbols))
+        lines = []
+        for row in range(self.rows):
+            start = row * self.columns
+            end = start + self.columns
+            lines.append(text[start:end])
+        return lines
@@ -0,0 +1,40 @@
+"""logging which keeps file writes off the game loop"""
+
+import logging
+import logging.handlers
+import queue
+
+from .constants import LOG_INTERVAL_TICKS
+
+
+def setup(path, level):
+    """send log records through the queue to the file written by a thread
+    returns started listener, stop it to flush the records"""
+    records = queue.SimpleQueue()
+    file_handler = logging.FileHandler(path)
+    file_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    # message is merged with its arguments here, the file handler formats it
+    queue_handler = logging.handlers.QueueHandler(records)
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    listener = logging.handlers.QueueListener(records, file_handler)
+    listener.start()
+    return listener
+
+
+class Sampler:
+    """lets through one event per `interval` ticks"""
+
+    __slots__ = ("interval", "next_tick")
+
+    def __init__(self, interval=LOG_INTERVAL_TICKS):
+        self.interval = interval
+        self.next_tick = 0
+
+    def __call__(self, tick):
+        """True when the event on the tick should be logged"""
+        if tick < self.next_tick:
+            return False
+        self.next_tick = tick + self.interval
+        return True
@@ -1,30 +1,480 @@
 """naive event loop implementation"""
 
-import asyncio
+import heapq
+import itertools
 import logging
+import math
+import os
+import selectors
+import signal
+import sys
 import time
 
-from .constants import TIC_TIMEOUT
+from .constants import (
+    TIC_TIMEOUT,
+    MAX_CATCHUP_TICKS,
+    STATS_SMOOTHING,
+    RENDER_BUDGET,
+    RENDER_MAX_INTERVAL,
+)
+from .governor import Governor
+from .logs import Sampler
 
 
-def run(canvas, coroutines):
-    """invoke coroutines, collect exhausted coroutines"""
-    while coroutines:
-        finished_coroutines = set()
-        for coro in coroutines:
+class Clock:
+    """fixed timestep clock
+
+    tick number `n` is due at `origin + n * tick_timeout`, so time spent
+    inside the tick is subtracted from the following sleep. When the loop
+    falls behind it runs the late ticks back to back, and when it falls
+    behind by more than `max_catchup` ticks it drops them and starts over
+    from the current moment. Uncapped clock never sleeps, ticks run as
+    fast as they can.
+
+    With `input_func` the clock waits for input instead of sleeping. Then
+    ticks with no work pass idle, and input arriving before the deadline
+    makes the next tick due at once. The ticks after it stay due on the
+    schedule, so input doesn't speed the game up. With no work at all the
+    clock waits for input as long as it takes.
+    """
+
+    def __init__(
+        self,
+        tick_timeout=TIC_TIMEOUT,
+        max_catchup=MAX_CATCHUP_TICKS,
+        time_func=time.monotonic,
+        sleep_func=time.sleep,
+        capped=True,
+        input_func=None,
+    ):
+        self.tick_timeout = tick_timeout
+        self.max_catchup = max_catchup
+        self.time_func = time_func
+        self.sleep_func = sleep_func
+        self.capped = capped
+        self.input_func = input_func
+        self.tick = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.tick_rate = 0.0
+        self.tick_cost = 0.0
+        self.jitter = 0.0
+        self._origin = 0.0
+        self._tick_started = 0.0
+        self._woken = False
+
+    def start(self):
+        """reset counters and make tick 0 due right now"""
+        self.tick = self.overruns = self.skipped = 0
+        self.tick_rate = self.tick_cost = self.jitter = 0.0
+        self._origin = self._tick_started = self.time_func()
+        self._woken = False
+
+    def deadline(self, tick):
+        """moment when the tick is due"""
+        return self._origin + tick * self.tick_timeout
+
+    def wait(self, until=None):
+        """sleep until the next tick is due, update statistics
+        `until` is the next tick with work, ticks before it may pass idle.
+        Returns False when there is certainly no input to read."""
+        now = self.time_func()
+        self.tick_cost = _smooth(self.tick_cost, now - self._tick_started)
+        self.tick += 1
+        input_ready = True
+        if not self.capped:
+            deadline = self._rebase(now)
+        elif self.input_func is None:
+            deadline = self._sleep(now)
+        else:
+            deadline, input_ready = self._wait_input(now, until)
+
+        started = self.time_func()
+        self.jitter = _smooth(self.jitter, abs(started - deadline))
+        period = started - self._tick_started
+        if period > 0:
+            self.tick_rate = _smooth(self.tick_rate, 1 / period)
+        self._tick_started = started
+        return input_ready
+
+    def _sleep(self, now):
+        """sleep until the current tick deadline, return the deadline"""
+        deadline = self.deadline(self.tick)
+        delay = deadline - now
+        if delay > 0:
+            self.sleep_func(delay)
+            return deadline
+        self.overruns += 1
+        lag = int(-delay // self.tick_timeout)
+        if lag > self.max_catchup:
+            # too late to catch up, forget the missed ticks
+            self.skipped += lag
+            deadline = self._rebase(now)
+        return deadline
+
+    def _wait_input(self, now, until):
+        """wait for input up to the deadline of `until` tick or without
+        timeout if it's None, returns the deadline and whether there is input"""
+        if self._woken and self.input_func(0):
+            # input is left unread, don't wake up on it again
+            return self._sleep(now), True
+        self._woken = False
+        next_tick = self.tick
+        timeout = None
+        if until is not None:
+            self.tick = max(until, next_tick)
+            timeout = self.deadline(self.tick) - now
+            if timeout <= 0:
+                return self._sleep(now), self.input_func(0)
+        if not self.input_func(timeout):
+            return self.deadline(self.tick), False
+        # run the tick right now, the late one if ticks passed idle,
+        # the schedule of the following ticks is kept
+        now = self.time_func()
+        passed = int((now - self._origin) // self.tick_timeout)
+        if until is not None:
+            passed = min(passed, self.tick)
+        self.tick = max(next_tick, passed)
+        self._woken = True
+        return now, True
+
+    def late(self):
+        """True if the tick after the current one is already due"""
+        return self.time_func() >= self.deadline(self.tick + 1)
+
+    def _rebase(self, now):
+        """make the current tick due at `now`"""
+        self._origin = now - self.tick * self.tick_timeout
+        return now
+
+    def stats(self):
+        """snapshot of measured values"""
+        return {
+            "tick": self.tick,
+            "tick_rate": self.tick_rate,
+            "tick_cost": self.tick_cost,
+            "jitter": self.jitter,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+        }
+
+
+class FramePacer:
+    """decide which ticks end with canvas refresh
+
+    simulation runs every tick, the canvas is refreshed every `interval`
+    ticks. The interval grows while refreshes take more than `budget` part
+    of the tick and shrinks back when the terminal keeps up. Frame is also
+    dropped when the loop is late, but there are no more than
+    `max_interval` ticks in a row without refresh. Uncapped loop refreshes
+    on every tick.
+    """
+
+    def __init__(
+        self,
+        budget=RENDER_BUDGET,
+        max_interval=RENDER_MAX_INTERVAL,
+        time_func=time.perf_counter,
+    ):
+        self.budget = budget
+        self.max_interval = max_interval
+        self.time_func = time_func
+        self.interval = 1
+        self.render_cost = 0.0
+        self.rendered = 0
+        self.dropped = 0
+        self._waiting = 0
+
+    def start(self):
+        """reset counters"""
+        self.interval = 1
+        self.render_cost = 0.0
+        self.rendered = self.dropped = self._waiting = 0
+
+    def render(self, canvas, clock):
+        """refresh canvas if the frame is due, return True if refreshed"""
+        self._waiting += 1
+        if clock.capped and self._waiting < self.max_interval:
+            if self._waiting < self.interval or clock.late():
+                self.dropped += 1
+                return False
+
+        started = self.time_func()
+        canvas.refresh()
+        self.render_cost = _smooth(self.render_cost, self.time_func() - started)
+        interval = math.ceil(self.render_cost / (clock.tick_timeout * self.budget))
+        self.interval = min(max(interval, 1), self.max_interval)
+        self.rendered += 1
+        self._waiting = 0
+        return True
+
+    def stats(self):
+        """snapshot of measured values"""
+        return {
+            "interval": self.interval,
+            "render_cost": self.render_cost,
+            "rendered": self.rendered,
+            "dropped": self.dropped,
+        }
+
+
+def _smooth(average, value):
+    """exponential moving average, first value is taken as is"""
+    if not average:
+        return value
+    return average + (value - average) * STATS_SMOOTHING
+
+
+class InputSelector:
+    """wait until the file, stdin by default, has data to read
+
+    arrival of any of `signals` counts as input too and sets `signalled`.
+    The signals are handled by Python then, it writes them into the pipe
+    the selector watches. `close` gives the signals and the wakeup file
+    descriptor back to their previous handlers.
+    """
+
+    def __init__(self, file=None, signals=()):
+        self.file = sys.stdin if file is None else file
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.file, selectors.EVENT_READ)
+        self.signalled = False
+        self._wakeup = None
+        self._previous_fd = -1
+        self._previous_handlers = {}
+        if signals:
+            self._wakeup = os.pipe()
+            for end in self._wakeup:
+                os.set_blocking(end, False)
+            self._previous_fd = signal.set_wakeup_fd(self._wakeup[1])
+            for number in signals:
+                self._previous_handlers[number] = signal.signal(number, _ignore_signal)
+            self.selector.register(self._wakeup[0], selectors.EVENT_READ)
+
+    def __call__(self, timeout):
+        """True if there is input, False when timeout expired"""
+        events = self.selector.select(timeout)
+        for key, _ in events:
+            if self._wakeup is not None and key.fd == self._wakeup[0]:
+                os.read(key.fd, 512)
+                self.signalled = True
+        return bool(events)
+
+    def close(self):
+        """stop watching the file and the signals"""
+        self.selector.close()
+        if self._wakeup is not None:
+            for number, handler in self._previous_handlers.items():
+                # None is a handler not installed from Python
+                signal.signal(number, signal.SIG_DFL if handler is None else handler)
+            signal.set_wakeup_fd(self._previous_fd)
+            for end in self._wakeup:
+                os.close(end)
+            self._wakeup = None
+
+
+def _ignore_signal(number, frame):
+    """signal handler, the signal only has to wake the selector up"""
+
+
+class Task:
+    """handle of the coroutine spawned in the run queue"""
+
+    __slots__ = ("coro", "queue", "name", "done", "cancelled", "suspended")
+
+    def __init__(self, coro, queue, name=None):
+        self.coro = coro
+        self.queue = queue
+        self.name = name
+        self.done = False
+        self.cancelled = False
+        self.suspended = False
+
+    def cancel(self):
+        """stop the task, it will never be resumed again"""
+        self.queue.cancel(self)
+
+    def resume(self):
+        """resume task suspended by `suspend` on the next tick"""
+        self.queue.resume(self)
+
+
+class RunQueue:
+    """coroutines scheduled for execution by the loop
+
+    task spawned during a tick starts on the next one. Task suspended by
+    `sleep` is parked in the timers heap and is not resumed at all until
+    its deadline tick comes. Task suspended by `wait_input` is resumed on
+    the tick the loop reports input on. Task suspended by `suspend` is not
+    resumed until somebody calls its `resume`. Finished and cancelled tasks are
+    dropped lazily, so removal costs O(1). Every resume is timed by the `profiler`
+    when there is one.
+    """
+
+    def __init__(self):
+        self.tasks = set()
+        self._ready = []
+        self._spawned = []
+        self._timers = []
+        self._waiting_input = []
+        self._sequence = itertools.count()
+        self._current = None
+        self.profiler = None
+
+    def __len__(self):
+        return len(self.tasks)
+
+    @property
+    def parked(self):
+        """number of live tasks in the timers heap, cancelled tasks the heap
+        keeps until their tick are not counted"""
+        return sum(not task.done for _, _, task in self._timers)
+
+    def spawn(self, coro, name=None):
+        """schedule coroutine for execution, return task handle
+        `name` is the kind of task profiler accounts it as"""
+        task = Task(coro, self, name)
+        self.tasks.add(task)
+        self._spawned.append(task)
+        return task
+
+    def extend(self, coroutines, name=None):
+        """spawn several coroutines at once"""
+        return [self.spawn(coro, name) for coro in coroutines]
+
+    def cancel(self, task):
+        """remove task from the queue, close its coroutine"""
+        if task.done:
+            return
+        task.done = task.cancelled = True
+        self.tasks.discard(task)
+        if task is not self._current:
+            task.coro.close()
+
+    def resume(self, task):
+        """schedule suspended task for the next tick"""
+        if task.suspended and not task.done:
+            task.suspended = False
+            self._ready.append(task)
+
+    def next_tick(self, tick):
+        """the next tick after `tick` with tasks to resume, None if only
+        tasks waiting for input or suspended are left"""
+        if self._ready or self._spawned:
+            return tick + 1
+        if self._timers:
+            return max(self._timers[0][0], tick + 1)
+        return None
+
+    def step(self, tick, input_ready=True):
+        """resume every task which is due on the tick
+        tasks waiting for input are resumed while `input_ready`"""
+        ready, self._ready = self._ready, []
+        timers = self._timers
+        while timers and timers[0][0] <= tick:
+            ready.append(heapq.heappop(timers)[2])
+        if input_ready and self._waiting_input:
+            ready.extend(self._waiting_input)
+            self._waiting_input = []
+        ready.extend(self._spawned)
+        self._spawned = []
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.tick = tick
+
+        for task in ready:
+            if task.done:
+                continue
+            self._current = task
             try:
-                coro.send(None)
+                if profiler is None:
+                    ticks = task.coro.send(None)
+                else:
+                    ticks = profiler.send(task)
             except StopIteration:
-                finished_coroutines.add(coro)
-        canvas.refresh()
-        for coro in finished_coroutines:
-            coroutines.remove(coro)
-        logging.debug("Coroutines count: %d", len(coroutines))
-        time.sleep(TIC_TIMEOUT)  # limit event-loop frequency
+                task.done = True
+                self.tasks.discard(task)
+                continue
+            finally:
+                self._current = None
+            if task.cancelled:
+                task.coro.close()
+            elif ticks == _INPUT:
+                self._waiting_input.append(task)
+            elif ticks == _SUSPEND:
+                task.suspended = True
+            elif ticks is not None and ticks > 1:
+                heapq.heappush(timers, (tick + ticks, next(self._sequence), task))
+            else:
+                self._ready.append(task)
+
+
+clock = Clock()
+pacer = FramePacer()
+governor = Governor()
+
+
+def run(canvas, coroutines, ticks=None):
+    """invoke coroutines from the run queue while there are any
+    or until the number of `ticks` passed"""
+    clock.start()
+    pacer.start()
+    governor.start()
+    sampler = Sampler()
+    input_ready = True
+    while coroutines and (ticks is None or clock.tick < ticks):
+        coroutines.step(clock.tick, input_ready)
+        pacer.render(canvas, clock)
+        governor.update(clock)
+        if sampler(clock.tick):
+            logging.debug(
+                "Tick %d, coroutines: %d, parked: %d, tick cost: %.3f ms,"
+                " render interval: %d, pressure: %d, spawn cap: %s",
+                clock.tick,
+                len(coroutines),
+                coroutines.parked,
+                clock.tick_cost * 1e3,
+                pacer.interval,
+                governor.pressure,
+                governor.spawn_cap,
+            )
+        # limit event-loop frequency, idle while there is nothing to do
+        input_ready = clock.wait(coroutines.next_tick(clock.tick))
         canvas.border()
 
 
+# values yielded by coroutine waiting for input and suspended one
+_INPUT = -1
+_SUSPEND = -2
+
+
+class _Park:
+    """awaitable asking the loop to park coroutine for some ticks"""
+
+    __slots__ = ("ticks",)
+
+    def __init__(self, ticks):
+        self.ticks = ticks
+
+    def __await__(self):
+        yield self.ticks
+
+
 async def sleep(seconds):
-    """asyncio.sleep(0) wrapper"""
-    for _ in range(int(seconds // TIC_TIMEOUT) or 1):
-        await asyncio.sleep(0)
+    """suspend coroutine for `seconds`, but at least for one tick"""
+    await _Park(int(seconds // TIC_TIMEOUT) or 1)
+
+
+async def sleep_ticks(ticks):
+    """suspend coroutine for the number of ticks, at least for one"""
+    await _Park(ticks)
+
+
+async def wait_input():
+    """suspend coroutine until there may be keys pressed"""
+    await _Park(_INPUT)
+
+
+async def suspend():
+    """suspend coroutine until its task is resumed"""
+    await _Park(_SUSPEND)
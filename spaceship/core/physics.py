@@ -44,6 +44,7 @@ def update_speed(
     row_speed_limit=2,
     column_speed_limit=2,
     fading=0.8,
+    validate=True,
 ):
     """Update speed smootly to make control handy for player.
     Return new speed value (row_speed, column_speed)
@@ -57,20 +58,26 @@ def update_speed(
        -1 — if force pulls left
        0  — if force has no effect
        1  — if force pulls right
-    """
-
-    if rows_direction not in (-1, 0, 1):
-        raise ValueError(
-            f"Wrong rows_direction value {rows_direction}. Expects -1, 0 or 1."
-        )
 
-    if columns_direction not in (-1, 0, 1):
-        raise ValueError(
-            f"Wrong columns_direction value {columns_direction}. Expects -1, 0 or 1."
-        )
+    validate=False skips checks of arguments known to be valid.
+    """
 
-    if fading < 0 or fading > 1:
-        raise ValueError(f"Wrong fading value {fading}. Expects float between 0 and 1.")
+    if validate:
+        if rows_direction not in (-1, 0, 1):
+            raise ValueError(
+                f"Wrong rows_direction value {rows_direction}. Expects -1, 0 or 1."
+            )
+
+        if columns_direction not in (-1, 0, 1):
+            raise ValueError(
+                f"Wrong columns_direction value {columns_direction}."
+                " Expects -1, 0 or 1."
+            )
+
+        if fading < 0 or fading > 1:
+            raise ValueError(
+                f"Wrong fading value {fading}. Expects float between 0 and 1."
+            )
 
     # гасим скорость, чтобы корабль останавливался со временем
     row_speed *= fading
@@ -0,0 +1,31 @@
+"""pools of reusable instances"""
+
+
+class Pool:
+    """bounded stock of released instances ready for reuse
+
+    pooled class must implement `reset` taking the same arguments as
+    its constructor
+    """
+
+    def __init__(self, cls, size):
+        self.cls = cls
+        self.size = size
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args):
+        """reset released instance or create a new one"""
+        if self.free:
+            instance = self.free.pop()
+            instance.reset(*args)
+            self.reused += 1
+            return instance
+        self.created += 1
+        return self.cls(*args)
+
+    def release(self, instance):
+        """keep instance for reuse unless the pool is full"""
+        if len(self.free) < self.size:
+            self.free.append(instance)
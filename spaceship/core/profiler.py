@@ -0,0 +1,135 @@
+"""per task profiler of the run queue"""
+
+import collections
+import curses
+import json
+import time
+
+from .constants import PROFILER_BUCKETS, PROFILER_TRACE_EVENTS, PROFILER_OVERLAY_LINES
+from .loop import sleep
+
+
+class KindStats:
+    """durations of resumes of tasks with the same name
+
+    histogram bucket `n` counts resumes which took less than `2 ** n`
+    microseconds, the last bucket counts everything longer.
+    """
+
+    __slots__ = ("calls", "total", "longest", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.longest = 0.0
+        self.histogram = [0] * PROFILER_BUCKETS
+
+    def add(self, duration):
+        """account one resume"""
+        self.calls += 1
+        self.total += duration
+        if duration > self.longest:
+            self.longest = duration
+        bucket = min(int(duration * 1e6).bit_length(), PROFILER_BUCKETS - 1)
+        self.histogram[bucket] += 1
+
+    @property
+    def mean(self):
+        """average resume duration"""
+        return self.total / self.calls if self.calls else 0.0
+
+    def percentile(self, fraction):
+        """upper bound of the resume duration for the fraction of calls"""
+        count = 0
+        for bucket, bucket_count in enumerate(self.histogram):
+            count += bucket_count
+            if count >= fraction * self.calls:
+                return min(2 ** bucket / 1e6, self.longest)
+        return self.longest
+
+
+class Profiler:
+    """time every resume of every task and aggregate it by task name
+
+    task without a name is accounted by its coroutine name. The last
+    `trace_limit` resumes are kept for the trace file.
+    """
+
+    def __init__(self, time_func=time.perf_counter, trace_limit=PROFILER_TRACE_EVENTS):
+        self.time_func = time_func
+        self.kinds = collections.defaultdict(KindStats)
+        self.trace = collections.deque(maxlen=trace_limit)
+        self.tick = 0
+        self.overlay = False
+        self._origin = time_func()
+
+    def send(self, task):
+        """resume task coroutine, measure how long it took"""
+        started = self.time_func()
+        try:
+            return task.coro.send(None)
+        finally:
+            finished = self.time_func()
+            name = task.name or task.coro.__qualname__
+            self.kinds[name].add(finished - started)
+            self.trace.append((name, started, finished - started, self.tick))
+
+    def toggle_overlay(self):
+        """show or hide statistics on the canvas"""
+        self.overlay = not self.overlay
+
+    def report(self, limit=None):
+        """statistics lines of the most expensive kinds of tasks"""
+        kinds = sorted(self.kinds.items(), key=lambda item: -item[1].total)
+        header = ("task", "calls", "mean µs", "p99 µs", "max µs")
+        lines = ["{:<20} {:>8} {:>8} {:>8} {:>8}".format(*header)]
+        for name, stats in kinds[:limit]:
+            lines.append(
+                f"{name[:20]:<20} {stats.calls:>8}"
+                f" {stats.mean * 1e6:>8.1f}"
+                f" {stats.percentile(0.99) * 1e6:>8.1f}"
+                f" {stats.longest * 1e6:>8.1f}"
+            )
+        return lines
+
+    def trace_events(self):
+        """kept resumes as Chrome trace event format dict"""
+        events = [
+            {
+                "name": name,
+                "cat": "task",
+                "ph": "X",
+                "ts": (started - self._origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": 1,
+                "tid": 1,
+                "args": {"tick": tick},
+            }
+            for name, started, duration, tick in self.trace
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path):
+        """save kept resumes, the file opens in chrome://tracing or Perfetto"""
+        with open(path, "w") as f_d:
+            json.dump(self.trace_events(), f_d)
+
+
+async def show(canvas, profiler):
+    """draw statistics in the upper left corner while overlay is on"""
+    geometry = canvas.geometry
+    shown = []
+    while True:
+        rows_number, columns_number = geometry.rows, geometry.columns
+        for row, line in shown:
+            canvas.addstr(row, 3, " " * len(line))
+        shown = []
+        if profiler.overlay:
+            lines = profiler.report(PROFILER_OVERLAY_LINES)
+            for row, line in enumerate(lines, start=4):
+                if row >= rows_number - 1:
+                    break
+                line = line[: max(columns_number - 4, 0)]
+                canvas.addstr(row, 3, line, curses.A_REVERSE)
+                shown.append((row, line))
+        await sleep(0.5)
@@ -0,0 +1,179 @@
+"""struct of arrays storage of obstacles"""
+
+import heapq
+from array import array
+
+
+class ObstacleRegistry:
+    """positions, sizes and flags of obstacles kept in parallel arrays
+
+    obstacle is referenced by its index in the arrays. Indexes of removed
+    obstacles are reused lowest first and dead entries at the end of the
+    arrays are cut off, so memory follows the number of live obstacles.
+    Every intact obstacle is also put into the spatial `grid` and collision
+    queries only test the obstacles found there.
+
+    obstacle may have row masks of its occupied cells, see
+    `objects.frame.get_row_masks`. Then the boxes overlap is only the broad
+    phase and a hit needs the masks to share a cell at drawn positions.
+    Obstacle without masks fills its whole box.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.rows = array("d")
+        self.columns = array("d")
+        self.rows_sizes = array("l")
+        self.columns_sizes = array("l")
+        self.destroyed = array("b")
+        self.alive = array("b")
+        self.masks = []
+        self.free = []
+        self.live = 0
+        self.added = 0
+        self.reaped = 0
+
+    def __len__(self):
+        return self.live
+
+    def __iter__(self):
+        """indexes of live obstacles"""
+        alive = self.alive
+        return (index for index in range(len(alive)) if alive[index])
+
+    def add(self, row, column, rows_size, columns_size, masks=None):
+        """register obstacle, return its index"""
+        values = (row, column, rows_size, columns_size, 0, 1, masks)
+        self.live += 1
+        self.added += 1
+        free = self.free
+        while free and free[0] >= len(self.alive):
+            heapq.heappop(free)  # cut off already
+        if free:
+            index = heapq.heappop(free)
+            for values_array, value in zip(self._arrays(), values):
+                values_array[index] = value
+        else:
+            index = len(self.alive)
+            for values_array, value in zip(self._arrays(), values):
+                values_array.append(value)
+        self.grid.insert(index, index, row, column, rows_size, columns_size)
+        return index
+
+    def _arrays(self):
+        return (
+            self.rows,
+            self.columns,
+            self.rows_sizes,
+            self.columns_sizes,
+            self.destroyed,
+            self.alive,
+            self.masks,
+        )
+
+    def remove(self, index):
+        """forget obstacle, its index may be given to another one"""
+        alive = self.alive
+        alive[index] = 0
+        heapq.heappush(self.free, index)
+        self.grid.remove(index)
+        self.live -= 1
+        self.reaped += 1
+        while alive and not alive[-1]:
+            for values_array in self._arrays():
+                values_array.pop()
+
+    def move(self, index, row, column):
+        """update obstacle position"""
+        self.rows[index] = row
+        self.columns[index] = column
+        if not self.destroyed[index]:
+            rows_size, columns_size = self.rows_sizes[index], self.columns_sizes[index]
+            self.grid.move(index, row, column, rows_size, columns_size)
+
+    def destroy(self, index):
+        """mark obstacle destroyed, it doesn't collide anymore"""
+        self.destroyed[index] = 1
+        self.grid.remove(index)
+
+    def destroy_all(self):
+        """mark every obstacle destroyed"""
+        for index in self:
+            self.destroy(index)
+
+    def stats(self):
+        """counters of obstacles and size of the storage"""
+        return {
+            "live": self.live,
+            "added": self.added,
+            "reaped": self.reaped,
+            "capacity": len(self.alive),
+        }
+
+    def box(self, index):
+        """tuple (row, column, rows_size, columns_size)"""
+        return (
+            self.rows[index],
+            self.columns[index],
+            self.rows_sizes[index],
+            self.columns_sizes[index],
+        )
+
+    def _overlapping(self, row, column, rows_size, columns_size, masks):
+        """generate indexes of intact obstacles overlapping the box,
+        obstacles with masks or given masks are tested cell by cell"""
+        rows, columns = self.rows, self.columns
+        rows_sizes, columns_sizes = self.rows_sizes, self.columns_sizes
+        destroyed, obstacles_masks = self.destroyed, self.masks
+        last_row, last_column = row + rows_size, column + columns_size
+        for index in self.grid.query_box(row, column, rows_size, columns_size):
+            if (
+                destroyed[index]
+                or rows[index] >= last_row
+                or row >= rows[index] + rows_sizes[index]
+                or columns[index] >= last_column
+                or column >= columns[index] + columns_sizes[index]
+            ):
+                continue
+            if masks is None and obstacles_masks[index] is None:
+                yield index
+            elif _touches(
+                (row, column, rows_size, columns_size, masks),
+                (*self.box(index), obstacles_masks[index]),
+            ):
+                yield index
+
+    def collisions(self, row, column, rows_size=1, columns_size=1, masks=None):
+        """indexes of intact obstacles overlapping the box or the masks"""
+        return list(self._overlapping(row, column, rows_size, columns_size, masks))
+
+    def find_collision(self, row, column, rows_size=1, columns_size=1, masks=None):
+        """index of any intact obstacle overlapping the box or the masks or None"""
+        overlapping = self._overlapping(row, column, rows_size, columns_size, masks)
+        return next(overlapping, None)
+
+
+def _touches(first, second):
+    """whether two (row, column, rows_size, columns_size, masks) objects
+    share a cell when drawn, masks None means the whole box is filled"""
+    first_row, first_column, first_rows, first_columns, first_masks = first
+    second_row, second_column, second_rows, second_columns, second_masks = second
+    first_row, first_column = round(first_row), round(first_column)
+    second_row, second_column = round(second_row), round(second_column)
+    if first_masks is None:
+        first_masks = ((1 << first_columns) - 1,) * first_rows
+    if second_masks is None:
+        second_masks = ((1 << second_columns) - 1,) * second_rows
+    shift = second_column - first_column
+    top = max(first_row, second_row)
+    bottom = min(first_row + len(first_masks), second_row + len(second_masks))
+    for row in range(top, bottom):
+        first_mask = first_masks[row - first_row]
+        second_mask = second_masks[row - second_row]
+        if shift >= 0:
+            second_mask <<= shift
+        else:
+            first_mask <<= -shift
+        if first_mask & second_mask:
+            return True
+    return False
@@ -0,0 +1,97 @@
+"""recording and replaying of player controls and canvas resizes"""
+
+import struct
+
+from curses_tools import read_controls
+
+# magic, format version, random seed, canvas rows, canvas columns
+_HEADER = struct.Struct("<4sBQHH")
+_MAGIC = b"SPRC"
+_VERSION = 2
+# flag of the controls byte, new canvas rows and columns follow the byte
+_RESIZED = 1 << 5
+_SIZE = struct.Struct("<HH")
+
+
+def pack_controls(rows_direction, columns_direction, space_pressed):
+    """controls tuple as a single byte value"""
+    return (rows_direction + 1) | (columns_direction + 1) << 2 | space_pressed << 4
+
+
+def unpack_controls(value):
+    """byte value back to controls tuple"""
+    return (value & 3) - 1, (value >> 2 & 3) - 1, bool(value >> 4 & 1)
+
+
+class Recorder:
+    """write random seed, canvas size and controls of every tick into a file
+    canvas resized while keys are read is saved with the controls"""
+
+    def __init__(self, path, seed):
+        self.file = open(path, "wb")
+        self.seed = seed
+        self.ticks = 0
+        self.size = None
+
+    def read_controls(self, canvas):
+        """read keys pressed, save and return controls"""
+        if not self.ticks:
+            self.size = canvas.getmaxyx()
+            self.file.write(_HEADER.pack(_MAGIC, _VERSION, self.seed, *self.size))
+        controls = read_controls(canvas)
+        value = pack_controls(*controls)
+        size = canvas.getmaxyx()
+        if size == self.size:
+            self.file.write(bytes((value,)))
+        else:
+            self.size = size
+            self.file.write(bytes((value | _RESIZED,)) + _SIZE.pack(*size))
+        self.ticks += 1
+        return controls
+
+    def close(self):
+        """flush the recording"""
+        self.file.close()
+
+
+class Player:
+    """controls recorded by `Recorder`, one tuple per tick
+
+    `window` is the headless canvas the game is replayed on, recorded
+    resizes are made to it on the same ticks.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f_d:
+            data = f_d.read()
+        magic, version, self.seed, self.rows, self.columns = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a recording of version {_VERSION}")
+        self.controls = []
+        self.sizes = {}
+        offset = _HEADER.size
+        while offset < len(data):
+            value = data[offset]
+            offset += 1
+            if value & _RESIZED:
+                self.sizes[len(self.controls)] = _SIZE.unpack_from(data, offset)
+                offset += _SIZE.size
+            self.controls.append(unpack_controls(value & ~_RESIZED))
+        self.ticks = 0
+        self.window = None
+
+    def __len__(self):
+        return len(self.controls)
+
+    def read_controls(self, canvas):
+        """controls of the next recorded tick, nothing pressed after the end"""
+        if self.ticks >= len(self.controls):
+            return 0, 0, False
+        size = self.sizes.get(self.ticks)
+        if size is not None and self.window is not None:
+            self.window.resize(*size)
+            # the window sends KEY_RESIZE, the canvas follows it as it did
+            read_controls(canvas)
+        controls = self.controls[self.ticks]
+        self.ticks += 1
+        return controls
@@ -0,0 +1,89 @@
+"""uniform grid spatial index"""
+
+from .constants import GRID_CELL_ROWS, GRID_CELL_COLUMNS
+
+
+class Grid:
+    """bucket every object into the grid cells its bounding box overlaps
+
+    objects are stored by key, queries return values. A value is the thing
+    callers test precisely, the key is the thing which moves.
+    """
+
+    def __init__(self, cell_rows=GRID_CELL_ROWS, cell_columns=GRID_CELL_COLUMNS):
+        self.cell_rows = cell_rows
+        self.cell_columns = cell_columns
+        self.cells = {}
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def _span(self, row, column, rows_size, columns_size):
+        """cells range covered by the box, bounds are inclusive"""
+        return (
+            int(row // self.cell_rows),
+            int(column // self.cell_columns),
+            int((row + rows_size) // self.cell_rows),
+            int((column + columns_size) // self.cell_columns),
+        )
+
+    def _cells(self, span):
+        first_row, first_column, last_row, last_column = span
+        for cell_row in range(first_row, last_row + 1):
+            for cell_column in range(first_column, last_column + 1):
+                yield cell_row, cell_column
+
+    def insert(self, key, value, row, column, rows_size, columns_size):
+        """add object with the box to the index"""
+        span = self._span(row, column, rows_size, columns_size)
+        self.entries[key] = span, value
+        for cell in self._cells(span):
+            self.cells.setdefault(cell, {})[key] = value
+
+    def move(self, key, row, column, rows_size, columns_size):
+        """update box of the object, cheap while it stays in the same cells"""
+        old_span, value = self.entries[key]
+        span = self._span(row, column, rows_size, columns_size)
+        if span == old_span:
+            return
+        self._discard(key, old_span)
+        self.insert(key, value, row, column, rows_size, columns_size)
+
+    def remove(self, key):
+        """drop object from the index if it's there"""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self._discard(key, entry[0])
+
+    def _discard(self, key, span):
+        for cell in self._cells(span):
+            bucket = self.cells[cell]
+            del bucket[key]
+            if not bucket:
+                del self.cells[cell]
+
+    def query_point(self, row, column):
+        """values whose boxes may contain the point"""
+        cell = int(row // self.cell_rows), int(column // self.cell_columns)
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            return ()
+        return list(bucket.values())
+
+    def query_box(self, row, column, rows_size, columns_size):
+        """values whose boxes may overlap the box"""
+        span = self._span(row, column, rows_size, columns_size)
+        first_row, first_column, last_row, last_column = span
+        if first_row == last_row and first_column == last_column:
+            bucket = self.cells.get((first_row, first_column))
+            return list(bucket.values()) if bucket else ()
+        found = {}
+        for cell in self._cells(span):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return list(found.values())
@@ -1,11 +1,20 @@
 """predefined code"""
 
+import curses
+import re
+
 
 SPACE_KEY_CODE = 32
 LEFT_KEY_CODE = 260
 RIGHT_KEY_CODE = 261
 UP_KEY_CODE = 259
 DOWN_KEY_CODE = 258
+PROFILER_KEY_CODE = ord("p")
+
+# callbacks of keys which are not the controls, by key code
+key_handlers = {}
+
+_RUN_PATTERN = re.compile(r"[^ ]+")
 
 
 def get_canvas_center(canvas):
@@ -42,6 +51,10 @@ def read_controls(canvas):
         if pressed_key_code == SPACE_KEY_CODE:
             space_pressed = True
 
+        handler = key_handlers.get(pressed_key_code)
+        if handler is not None:
+            handler()
+
     return rows_direction, columns_direction, space_pressed
 
 
@@ -49,33 +62,62 @@ def draw_frame(canvas, start_row, start_column, text, negative=False):
     """Draw multiline text fragment on canvas.
     Erase text instead of drawing if negative=True is specified."""
 
-    rows_number, columns_number = canvas.getmaxyx()
+    draw_runs(canvas, start_row, start_column, get_frame_runs(text), negative)
+
+
+def get_frame_runs(text):
+    """Split multiline text fragment into runs of non-space symbols.
+    Returns list of tuples (row offset, column offset, run), sorted by row"""
+
+    return [
+        (row, match.start(), match.group())
+        for row, line in enumerate(text.splitlines())
+        for match in _RUN_PATTERN.finditer(line)
+    ]
 
-    for row, line in enumerate(text.splitlines(), round(start_row)):
+
+def draw_runs(canvas, start_row, start_column, runs, negative=False):
+    """Draw runs prepared by `get_frame_runs`, clip them by canvas borders.
+    Erase runs instead of drawing if negative=True is specified."""
+
+    geometry = canvas.geometry
+    rows_number, columns_number = geometry.rows, geometry.columns
+    start_row, start_column = round(start_row), round(start_column)
+
+    for row_offset, column_offset, run in runs:
+        row = start_row + row_offset
         if row < 0:
             continue
 
         if row >= rows_number:
             break
 
-        for column, symbol in enumerate(line, round(start_column)):
-            if column < 0:
-                continue
+        column = start_column + column_offset
+        if column < 0:
+            run = run[-column:]
+            column = 0
+
+        # Curses will raise exception on writing into the lower right corner
+        # https://docs.python.org/3/library/curses.html#curses.window.addch
+        right_border = columns_number - (row == rows_number - 1)
+        if column + len(run) > right_border:
+            run = run[: max(right_border - column, 0)]
+
+        if not run:
+            continue
 
-            if column >= columns_number:
-                break
+        if negative:
+            run = " " * len(run)
+        canvas.addstr(row, column, run)
 
-            if symbol == " ":
-                continue
 
-            # Check if current position it is not in a lower right corner of the window
-            # Curses will raise exception in that case. Don`t ask why…
-            # https://docs.python.org/3/library/curses.html#curses.window.addch
-            if row == rows_number - 1 and column == columns_number - 1:
-                continue
+def beep():
+    """Beep if there is a terminal, headless canvas has no one."""
 
-            symbol = symbol if not negative else " "
-            canvas.addch(row, column, symbol)
+    try:
+        curses.beep()
+    except curses.error:
+        pass
 
 
 def get_frame_size(text):
@@ -2,73 +2,153 @@
 
 """application entry point"""
 
+import argparse
 import asyncio
 import curses
 import logging
 import os
+import random
+import signal
 
 from core.animations import Explosion
-from core.constants import BASE_DIR
+from core.compositor import Compositor
+from core.constants import BASE_DIR, HEADLESS_ROWS, HEADLESS_COLUMNS, HEADLESS_TICKS
+from core.headless import HeadlessCanvas
+from core import logs
 import core.loop as loop
-from curses_tools import get_canvas_center, read_controls, get_justify_offset
-from settings import LOG_LEVEL, SPACE_ERA_BEGINNING, DEBUG
+from core import profiler as mprofiler
+from core.replay import Recorder, Player
+from curses_tools import (
+    get_canvas_center,
+    read_controls,
+    get_justify_offset,
+    key_handlers,
+    PROFILER_KEY_CODE,
+)
+import settings
 from state import coroutines, obstacles
 from objects.frame import Frame
+from objects.projectiles import Projectiles
 from objects.ship import new_ship
-from objects.stars import get_stars_coroutines
+from objects.stars import new_starfield
 from objects.obstacles import fill_space_with_garbage, show_obstacles
 from objects.timeline import Timeline, show as show_timeline
 from utils import read_all_frames
 
+# tasks moving the world, they are stopped when the game is over
+WORLD_TASKS = ("stars", "timeline", "timeline.show", "garbage.spawner", "garbage")
 
-def create_coroutines(canvas):
-    """create coroutines for execution"""
+
+def create_coroutines(canvas, controls=read_controls):
+    """create coroutines for execution, return ship, timeline and projectiles"""
     try:
         frames = read_all_frames()
     except IOError:
         logging.critical("could not read frames")
         exit(1)
 
-    if DEBUG:
-        coroutines.append(show_obstacles(canvas))
+    if settings.DEBUG:
+        coroutines.spawn(show_obstacles(canvas), "obstacles.debug")
+    if coroutines.profiler is not None:
+        coroutines.spawn(mprofiler.show(canvas, coroutines.profiler), "profiler")
     explosion = Explosion(canvas, frames["explosion"])
-    coroutines.extend(get_stars_coroutines(canvas))
-    timeline = Timeline(year=SPACE_ERA_BEGINNING)
-    coroutines.extend([timeline.run(), show_timeline(canvas, timeline)])
-    ship = new_ship(canvas, *get_canvas_center(canvas), frames["spaceship"], explosion)
+    coroutines.spawn(new_starfield(canvas).run(), "stars")
+    timeline = Timeline(year=settings.SPACE_ERA_BEGINNING)
+    coroutines.spawn(timeline.run(), "timeline")
+    coroutines.spawn(show_timeline(canvas, timeline), "timeline.show")
+    projectiles = Projectiles(canvas)
+    projectiles.start()
+    ship = new_ship(
+        canvas,
+        *get_canvas_center(canvas),
+        frames["spaceship"],
+        explosion,
+        projectiles,
+    )
     ship.start()
-    coroutines.append(handle_inputs(canvas, ship, frames))
-    coroutines.append(
-        fill_space_with_garbage(canvas, timeline, frames["garbage"], explosion)
+    coroutines.spawn(handle_inputs(canvas, ship, frames, controls), "ship.move")
+    coroutines.spawn(
+        fill_space_with_garbage(canvas, timeline, frames["garbage"], explosion),
+        "garbage.spawner",
     )
+    return ship, timeline, projectiles
 
 
-def draw(canvas):
+def draw(window, ticks=None, controls=read_controls):
     """create animations coroutines and run event loop"""
-    create_coroutines(canvas)
-    loop.run(canvas, coroutines)
+    canvas = Compositor(window)
+    # resize comes as KEY_RESIZE without the input selector, when recording,
+    # and from headless canvas; with the selector `follow_resize` handles
+    # SIGWINCH, and the KEY_RESIZE `resizeterm` queues finds the size updated
+    key_handlers[curses.KEY_RESIZE] = canvas.update_size
+    create_coroutines(canvas, controls)
+    if isinstance(loop.clock.input_func, loop.InputSelector):
+        coroutines.spawn(follow_resize(canvas, loop.clock.input_func), "resize")
+    loop.run(canvas, coroutines, ticks)
+
 
+def draw_headless(rows, columns, ticks, controls=read_controls):
+    """run the game on in-memory canvas at uncapped speed"""
+    canvas = HeadlessCanvas(rows, columns)
+    loop.clock.capped = False
+    draw(canvas, ticks, controls)
+    return canvas
 
-async def handle_inputs(canvas, ship, frames):
-    """async wrapper for controls handler"""
+
+async def handle_inputs(canvas, ship, frames, controls=read_controls):
+    """async wrapper for controls handler
+    `controls` reads the keys, it's replaced while recording or replaying"""
     gameover = Frame(
-        canvas, frames["gameover"], *get_justify_offset(canvas, frames["gameover"])
+        canvas,
+        frames["gameover"],
+        *get_justify_offset(canvas, frames["gameover"].text),
     )
+
+    def center_gameover(rows, columns):
+        gameover.row, gameover.column = get_justify_offset(
+            canvas, frames["gameover"].text
+        )
+
+    canvas.geometry.subscribe(center_gameover)
+    while not ship.destroyed:
+        row, column, shoot = controls(canvas)  # non-blocking
+        gameover.hide()
+        await ship.move(row, column)
+        if shoot:
+            ship.shoot()
+
+    # the world stands still, so the loop waits for keys only; the message
+    # is drawn once, and again after resize clears the canvas
+    stop_world()
+    gameover.show()
+    canvas.geometry.subscribe(lambda rows, columns: gameover.show())
     while True:
-        row, column, shoot = read_controls(canvas)  # non-blocking
-        if not ship.destroyed:
-            gameover.hide()
-            await ship.move(row, column)
-            if shoot:
-                ship.shoot()
-        else:
-            gameover.show()
-            if shoot:
-                for obstacle in obstacles:
-                    obstacle.destroyed = True
-                    await asyncio.sleep(0)
-                    exit(0)
+        await loop.wait_input()
+        _, _, shoot = controls(canvas)
+        if shoot:
+            obstacles.destroy_all()
             await asyncio.sleep(0)
+            exit(0)
+
+
+def stop_world():
+    """cancel tasks moving the world, flying garbage is forgotten"""
+    for task in list(coroutines.tasks):
+        if task.name in WORLD_TASKS:
+            task.cancel()
+
+
+async def follow_resize(canvas, selector):
+    """resize canvas when the terminal is resized
+    SIGWINCH doesn't make stdin readable and curses doesn't see it while
+    Python handles the signal, so the size is read here"""
+    while True:
+        await loop.wait_input()
+        if selector.signalled:
+            selector.signalled = False
+            columns, rows = os.get_terminal_size()
+            curses.resizeterm(rows, columns)
+            canvas.update_size()
 
 
 def init_curses():
@@ -81,17 +161,113 @@ def init_curses():
     curses.curs_set(False)
 
 
-def main():
-    """prepare canvas and use the draw function"""
-    logging.basicConfig(
-        filename=os.path.join(BASE_DIR, "../spaceship.log"), level=LOG_LEVEL
+def parse_args():
+    """command line arguments"""
+    parser = argparse.ArgumentParser(description="Spaceship game")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run without terminal at uncapped speed, print the last frame",
+    )
+    parser.add_argument("--ticks", type=int, help="stop after number of ticks")
+    parser.add_argument("--rows", type=int, default=HEADLESS_ROWS)
+    parser.add_argument("--columns", type=int, default=HEADLESS_COLUMNS)
+    parser.add_argument("--seed", type=int, help="seed of random generator")
+    parser.add_argument("--record", metavar="FILE", help="record controls into file")
+    parser.add_argument(
+        "--replay",
+        metavar="FILE",
+        help="replay recorded game without terminal at uncapped speed",
     )
+    parser.add_argument(
+        "--profile",
+        metavar="TRACE",
+        help="time every task, save Chrome trace into file, 'p' shows statistics",
+    )
+    return parser.parse_args()
+
+
+def print_result(canvas):
+    """print the last frame and loop statistics of headless game"""
+    print("\n".join(canvas.dump()))
+    print(loop.clock.stats())
+    print(loop.pacer.stats())
+    print(loop.governor.stats())
+    if coroutines.profiler is not None:
+        print("\n".join(coroutines.profiler.report()))
+
+
+def replay(path):
+    """play recorded game again"""
+    player = Player(path)
+    random.seed(player.seed)
+    canvas = player.window = HeadlessCanvas(player.rows, player.columns)
+    loop.clock.capped = False
+    draw(canvas, len(player), player.read_controls)
+    print_result(canvas)
+
+
+def play(args, controls):
+    """play in terminal or headless"""
+    if args.headless:
+        canvas = draw_headless(
+            args.rows, args.columns, args.ticks or HEADLESS_TICKS, controls
+        )
+        print_result(canvas)
+        return
     init_curses()
+    selector = None
+    if not args.record:
+        # recording needs controls of every tick, so the loop never idles,
+        # and the same game state, so the load doesn't change the game
+        selector = loop.InputSelector(signals=(signal.SIGWINCH,))
+        loop.clock.input_func = selector
+        loop.governor.adaptive = True
     try:
-        curses.wrapper(draw)
+        curses.wrapper(draw, args.ticks, controls)
     except KeyboardInterrupt:
         curses.endwin()
         print("Good Bye, major Tom")
+    finally:
+        if selector is not None:
+            loop.clock.input_func = None
+            selector.close()
+
+
+def start(args):
+    """replay, record or just play the game"""
+    if args.replay:
+        replay(args.replay)
+        return
+
+    seed = random.randrange(2 ** 32) if args.seed is None else args.seed
+    random.seed(seed)
+    if not args.record:
+        play(args, read_controls)
+        return
+
+    recorder = Recorder(args.record, seed)
+    try:
+        play(args, recorder.read_controls)
+    finally:
+        recorder.close()
+
+
+def main():
+    """prepare canvas and use the draw function"""
+    args = parse_args()
+    listener = logs.setup(
+        os.path.join(BASE_DIR, "../spaceship.log"), settings.LOG_LEVEL
+    )
+    if args.profile:
+        coroutines.profiler = mprofiler.Profiler()
+        key_handlers[PROFILER_KEY_CODE] = coroutines.profiler.toggle_overlay
+    try:
+        start(args)
+    finally:
+        if args.profile:
+            coroutines.profiler.write_trace(args.profile)
+        listener.stop()
 
 
 if __name__ == "__main__":
@@ -1,23 +1,51 @@
 """base class for frame-based objects"""
 
-from curses_tools import get_frame_size, draw_frame
+from curses_tools import get_frame_size, get_frame_runs, draw_runs
+
+
+def get_row_masks(runs, rows_size):
+    """bit `n` of the row mask is set if column `n` of the row is not empty"""
+    masks = [0] * rows_size
+    for row, column, run in runs:
+        masks[row] |= ((1 << len(run)) - 1) << column
+    return tuple(masks)
+
+
+class Sprite:
+    """frame text compiled for drawing and collisions:
+    size, runs of glyphs and masks of occupied cells"""
+
+    __slots__ = ("text", "rows_size", "columns_size", "runs", "masks")
+
+    def __init__(self, text):
+        self.text = text
+        self.rows_size, self.columns_size = get_frame_size(text)
+        self.runs = get_frame_runs(text)
+        self.masks = get_row_masks(self.runs, self.rows_size)
 
 
 class Frame:
-    """frame wrapper"""
+    """frame wrapper
+    `frame` is either text or already compiled sprite"""
 
     def __init__(self, canvas, frame, row, column):
         self.canvas = canvas
-        self.frame = frame
+        self.sprite = Sprite(frame) if isinstance(frame, str) else frame
         self.row = row
         self.column = column
-        self.rows_size, self.columns_size = get_frame_size(frame)
+        self.rows_size = self.sprite.rows_size
+        self.columns_size = self.sprite.columns_size
 
     @property
     def size(self):
         """return tuple rows_size, columns_size"""
         return self.rows_size, self.columns_size
 
+    @property
+    def masks(self):
+        """masks of occupied cells, one per row"""
+        return self.sprite.masks
+
     @property
     def center(self):
         """coordinates of center"""
@@ -28,14 +56,14 @@ class Frame:
         we can override row and column attributes
         """
         row, column = self._override_row_and_column(row, column)
-        draw_frame(self.canvas, row, column, self.frame)
+        draw_runs(self.canvas, row, column, self.sprite.runs)
 
     def hide(self, row=None, column=None):
         """hide frame from canvas
         we can override row and column attributes
         """
         row, column = self._override_row_and_column(row, column)
-        draw_frame(self.canvas, row, column, self.frame, negative=True)
+        draw_runs(self.canvas, row, column, self.sprite.runs, negative=True)
 
     def _override_attribute_value(self, attribute, value):
         """"""
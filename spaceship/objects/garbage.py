@@ -1,14 +1,28 @@
 import asyncio
 
+from state import obstacles
+
 
 class Garbage:
-    def __init__(self, canvas, row, column, frame, explosion):
+    """flying piece of garbage, `index` refers to its obstacle in registry"""
+
+    __slots__ = ("canvas", "index", "row", "column", "frame", "explosion")
+
+    def __init__(self, canvas, index, row, column, frame, explosion):
+        self.reset(canvas, index, row, column, frame, explosion)
+
+    def reset(self, canvas, index, row, column, frame, explosion):
+        """initialize new or pooled instance"""
         self.canvas = canvas
+        self.index = index
         self.row = row
         self.column = column
         self.frame = frame
         self.explosion = explosion
-        self.destroyed = False
+
+    @property
+    def destroyed(self):
+        return obstacles.destroyed[self.index]
 
     @property
     def center(self):
@@ -37,15 +51,13 @@ class Garbage:
     async def fly(self, speed=0.5):
         """Animate garbage, flying from top to bottom.
         Сolumn position will stay same, as specified on start."""
-        rows_number, columns_number = self.canvas.getmaxyx()
-
-        column = max(self.column, 0)
-        column = min(column, columns_number - 1)
+        geometry = self.canvas.geometry
 
-        while self.row < rows_number:
+        while self.row < geometry.rows:
             await self.render_frame()
             if self.destroyed:
                 await self.explosion.explode(*self.center)
                 return
             self.row += speed
-        self.destroyed = True  # fly out of screen
+            obstacles.move(self.index, self.row, self.column)
+        obstacles.destroy(self.index)  # fly out of screen
@@ -1,76 +1,25 @@
-"""obstacle class, animations and factory"""
+"""obstacles animations and factory"""
 
 import asyncio
 import logging
 import random
 
 from core import loop
+from core.constants import GARBAGE_POOL_SIZE
+from core.logs import Sampler
+from core.pool import Pool
 from curses_tools import draw_frame
 from objects import garbage, frame as mframe
-from settings import (
-    MIN_OBSTACLES_SPEED,
-    MAX_OBSTACLES_SPEED,
-    SPACE_ERA_BEGINNING,
-    YEAR_IN_SECONDS,
-)
+import settings
 from state import obstacles, coroutines
 from utils import rand
 
 
-class Obstacle():
-    """cosmic garbage"""
-
-    def __init__(self, obstacle):
-        self.obstacle = obstacle
-
-    @property
-    def destroyed(self):
-        return self.obstacle.destroyed
-
-    @destroyed.setter
-    def destroyed(self, value):
-        self.obstacle.destroyed = value
-
-    @property
-    def rows_size(self):
-        return self.obstacle.rows_size
-
-    @property
-    def columns_size(self):
-        return self.obstacle.columns_size
-
-    @property
-    def row(self):
-        return self.obstacle.row
-
-    @property
-    def column(self):
-        return self.obstacle.column
-
-    def get_bounding_box_frame(self):
-        """increment box size to compensate obstacle movement"""
-        rows, columns = self.rows_size + 1, self.columns_size + 1
-        return "\n".join(_get_bounding_box_lines(rows, columns))
-
-    def get_bounding_box_corner_pos(self):
-        """top left corner"""
-        return self.row - 1, self.column - 1
-
-    def dump_bounding_box(self):
-        """left top corner and bbox frame itself"""
-        row, column = self.get_bounding_box_corner_pos()
-        return row, column, self.get_bounding_box_frame()
-
-    def has_collision(
-        self, obj_corner_row, obj_corner_column, obj_size_rows=1, obj_size_columns=1
-    ):
-        """Determine if collision has occured. Return True or False."""
-        return has_collision(
-            (self.row, self.column),
-            (self.rows_size, self.columns_size),
-            (obj_corner_row, obj_corner_column),
-            (obj_size_rows, obj_size_columns),
-        )
+def dump_bounding_box(row, column, rows_size, columns_size):
+    """left top corner and bbox frame itself
+    box size is incremented to compensate obstacle movement"""
+    frame = "\n".join(_get_bounding_box_lines(rows_size + 1, columns_size + 1))
+    return row - 1, column - 1, frame
 
 
 def _get_bounding_box_lines(rows, columns):
@@ -82,16 +31,14 @@ def _get_bounding_box_lines(rows, columns):
 
 
 async def show_obstacles(canvas):
-    """Display bounding boxes of every obstacle in a list"""
+    """Display bounding boxes of every intact obstacle"""
 
     while True:
-        boxes = []
-        dead_obstacles = [obstacle for obstacle in obstacles if obstacle.destroyed]
-        for obstacle in dead_obstacles:
-            obstacles.remove(obstacle)
-
-        for obstacle in obstacles:
-            boxes.append(obstacle.dump_bounding_box())
+        boxes = [
+            dump_bounding_box(*obstacles.box(index))
+            for index in obstacles
+            if not obstacles.destroyed[index]
+        ]
 
         for row, column, frame in boxes:
             draw_frame(canvas, row, column, frame)
@@ -136,24 +83,46 @@ def has_collision(obstacle_corner, obstacle_size, obj_corner, obj_size=(1, 1)):
 
 async def fill_space_with_garbage(canvas, timeline, frames, explosion):
     """generates infinite garbage flow"""
-    _, canvas_width = canvas.getmaxyx()
+    garbage_frames = [mframe.Frame(canvas, sprite, None, None) for sprite in frames]
+    stats_sampler = Sampler()
     while True:
         try:
-            sleeping_time = YEAR_IN_SECONDS / (timeline.year - SPACE_ERA_BEGINNING)
+            sleeping_time = settings.YEAR_IN_SECONDS / (
+                timeline.year - settings.SPACE_ERA_BEGINNING
+            )
         except ZeroDivisionError:
-            sleeping_time = YEAR_IN_SECONDS
+            sleeping_time = settings.YEAR_IN_SECONDS
+
+        await loop.sleep(max(sleeping_time, settings.MIN_SPAWN_INTERVAL))
+        if not loop.governor.may_spawn(len(obstacles), settings.MAX_OBSTACLES):
+            continue
+        frame = random.choice(garbage_frames)
+        column = random.randint(1, canvas.geometry.columns - frame.columns_size - 1)
+        coroutines.spawn(
+            _fly(canvas, column, frame, explosion, _get_random_speed()), "garbage"
+        )
+        if stats_sampler(loop.clock.tick):
+            logging.debug("Obstacles: %s", obstacles.stats())
+
+
+async def _fly(canvas, column, frame, explosion, speed):
+    """register garbage obstacle and let it fly, then forget the obstacle
+    and return garbage into the pool. Nothing is registered until the task
+    starts, so a task cancelled before that leaves nothing behind."""
+    index = obstacles.add(0, column, *frame.size, frame.masks)
+    garbage_instance = _garbage_pool.acquire(
+        canvas, index, 0, column, frame, explosion
+    )
+    try:
+        await garbage_instance.fly(speed)
+    finally:
+        obstacles.remove(garbage_instance.index)
+        _garbage_pool.release(garbage_instance)
+
 
-        await loop.sleep(sleeping_time)
-        raw_frame = random.choice(frames)
-        frame = mframe.Frame(canvas, raw_frame, None, None)
-        column = random.randint(1, canvas_width - frame.columns_size - 1)
-        garbage_instance = garbage.Garbage(canvas, 0, column, frame, explosion)
-        obstacle = Obstacle(garbage_instance)
-        obstacles.append(obstacle)
-        coroutines.append(garbage_instance.fly(_get_random_speed()))
-        logging.debug("Obstacles count: %d", len(obstacles))
+_garbage_pool = Pool(garbage.Garbage, GARBAGE_POOL_SIZE)
 
 
 def _get_random_speed():
     """return random speed for obstacle"""
-    return rand(MIN_OBSTACLES_SPEED, MAX_OBSTACLES_SPEED)
+    return rand(settings.MIN_OBSTACLES_SPEED, settings.MAX_OBSTACLES_SPEED)
@@ -0,0 +1,135 @@
+"""gun shots"""
+
+import asyncio
+from array import array
+
+from core.loop import suspend
+from curses_tools import beep
+from state import coroutines, obstacles
+
+
+class Projectiles:
+    """every shot in flight, advanced, drawn and tested as one batch
+
+    shot `i` is described by the i-th items of the arrays. The first two
+    ticks of a shot are the muzzle flash, then it flies until it leaves
+    the canvas or hits an obstacle. Slots of finished shots are reused.
+    The task is suspended while nothing is in flight, `fire` resumes it.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.rows = array("d")
+        self.columns = array("d")
+        self.rows_speeds = array("d")
+        self.columns_speeds = array("d")
+        self.ages = array("L")
+        self.alive = array("b")
+        self.free_slots = []
+        self.fired = 0
+        self.hits = 0
+        self.task = None
+
+    def __len__(self):
+        return len(self.alive) - len(self.free_slots)
+
+    def fire(self, start_row, start_column, rows_speed=-0.3, columns_speed=0):
+        """add shot, direction and speed can be specified"""
+        self.fired += 1
+        values = (start_row, start_column, rows_speed, columns_speed, 0, 1)
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            for values_array, value in zip(self._arrays(), values):
+                values_array[slot] = value
+        else:
+            for values_array, value in zip(self._arrays(), values):
+                values_array.append(value)
+        if self.task is not None:
+            self.task.resume()
+
+    def start(self, queue=coroutines):
+        """spawn the task stepping shots"""
+        self.task = queue.spawn(self.run(), "bullets")
+
+    def _arrays(self):
+        return (
+            self.rows,
+            self.columns,
+            self.rows_speeds,
+            self.columns_speeds,
+            self.ages,
+            self.alive,
+        )
+
+    def _kill(self, slot):
+        self.alive[slot] = 0
+        self.free_slots.append(slot)
+
+    def step(self):
+        """advance, draw and test for collisions every shot"""
+        canvas = self.canvas
+        rows, columns = self.rows, self.columns
+        ages, alive = self.ages, self.alive
+        geometry = canvas.geometry
+        max_row, max_column = geometry.rows - 1, geometry.columns - 1
+        muzzle_left = False
+
+        for slot in range(len(alive)):
+            if not alive[slot]:
+                continue
+            age = ages[slot]
+            ages[slot] = age + 1
+            row, column = rows[slot], columns[slot]
+
+            if age == 0:
+                canvas.addstr(round(row), round(column), "*")
+                continue
+            if age == 1:
+                canvas.addstr(round(row), round(column), "O")
+                continue
+
+            canvas.addstr(round(row), round(column), " ")
+            if age > 2 and _hit_obstacle(row, column):
+                self.hits += 1
+                self._kill(slot)
+                continue
+
+            row += self.rows_speeds[slot]
+            column += self.columns_speeds[slot]
+            rows[slot], columns[slot] = row, column
+            if age == 2:
+                muzzle_left = True
+
+            if not (0 < row < max_row and 0 < column < max_column):
+                self._kill(slot)
+                continue
+            symbol = "-" if self.columns_speeds[slot] else "|"
+            canvas.addstr(round(row), round(column), symbol)
+
+        if muzzle_left:
+            beep()
+        if self.free_slots and len(self.free_slots) == len(alive):
+            self._clear()
+
+    def _clear(self):
+        """shrink arrays when there is nothing in flight"""
+        for values_array in self._arrays():
+            del values_array[:]
+        self.free_slots.clear()
+
+    async def run(self):
+        """step the whole batch once per tick while there are shots"""
+        while True:
+            if not len(self):
+                await suspend()
+            self.step()
+            await asyncio.sleep(0)
+
+
+def _hit_obstacle(row, column):
+    """mark obstacle under the point as destroyed, return True on hit"""
+    index = obstacles.find_collision(row, column)
+    if index is None:
+        return False
+    obstacles.destroy(index)
+    return True
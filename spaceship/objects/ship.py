@@ -3,7 +3,8 @@
 import itertools
 import logging
 
-from core.animations import fire
+from core import loop
+from core.logs import Sampler
 from core.loop import sleep
 from core.physics import update_speed
 from objects.frame import Frame
@@ -13,21 +14,26 @@ from state import coroutines, obstacles
 class Ship:
     """Define spaceship properties and behaviour"""
 
-    def __init__(self, canvas, row, column, frames, explosion):
+    def __init__(self, canvas, row, column, frames, explosion, projectiles):
         self.canvas = canvas
         self.row = row
         self.column = column
         self.explosion = explosion
+        self.projectiles = projectiles
         self.row_speed = 0
         self.column_speed = 0
         self.current_frame = None
         self.previous_frame = None
         self.destroyed = False
+        self.invulnerable = False
+        # every game has its own ship, so sampling starts over with the clock
+        self.speed_sampler = Sampler()
         self.frames = itertools.cycle([Frame(canvas, frame, 0, 0) for frame in frames])
 
     def start(self):
         """add infinite ship's coroutines into event loop"""
-        coroutines.extend([self.animate(), self.check_collision()])
+        coroutines.spawn(self.animate(), "ship.animate")
+        coroutines.spawn(self.check_collision(), "ship.collision")
 
     @property
     def size(self):
@@ -36,10 +42,21 @@ class Ship:
             return 0, 0
         return self.current_frame.size
 
+    @property
+    def masks(self):
+        """return masks of occupied cells of rendered frame"""
+        if self.current_frame is None:
+            return ()
+        return self.current_frame.masks
+
     def update_speed(self, row_direction, column_direction):
-        """update ship speed"""
+        """update ship speed, directions come from controls and are valid"""
         self.row_speed, self.column_speed = update_speed(
-            self.row_speed, self.column_speed, row_direction, column_direction
+            self.row_speed,
+            self.column_speed,
+            row_direction,
+            column_direction,
+            validate=False,
         )
 
     async def animate(self):
@@ -55,38 +72,37 @@ class Ship:
 
         border_width = 0
         frame_height, frame_width = self.size
-        canvas_height, canvas_width = self.canvas.getmaxyx()
+        geometry = self.canvas.geometry
+        canvas_height, canvas_width = geometry.rows, geometry.columns
 
         negative_frame = self.previous_frame or self.current_frame
         negative_frame.hide(self.row, self.column)
 
         self.update_speed(row_direction, column_direction)
-        logging.debug(
-            "row speed: %.3f, column speed: %.3f", self.row_speed, self.column_speed
-        )
-        if (
-            self.column - self.column_speed <= border_width + 1
-            and column_direction <= 0
-        ):
-            self.column = border_width + 1
+        if self.speed_sampler(loop.clock.tick):
+            logging.debug(
+                "row speed: %.3f, column speed: %.3f", self.row_speed, self.column_speed
+            )
+        # the ship stops at the border whatever the controls are, inertia may
+        # carry it against them
+        min_row = min_column = border_width + 1
+        max_row = canvas_height - border_width - 1 - frame_height
+        max_column = canvas_width - border_width - 1 - frame_width
+
+        if self.column + self.column_speed <= min_column:
+            self.column = min_column
             self.column_speed = 0
 
-        if (
-            self.column + frame_width + self.column_speed >= canvas_width - border_width
-            and column_direction >= 0
-        ):
-            self.column = canvas_width - frame_width - border_width - 1
+        if self.column + self.column_speed >= max_column:
+            self.column = max_column
             self.column_speed = 0
 
-        if self.row - self.row_speed <= border_width and row_direction <= 0:
-            self.row = border_width + 1
+        if self.row + self.row_speed <= min_row:
+            self.row = min_row
             self.row_speed = 0
 
-        if (
-            self.row + frame_height + self.row_speed >= canvas_height - border_width
-            and row_direction >= 0
-        ):
-            self.row = canvas_height - border_width - 1 - frame_height
+        if self.row + self.row_speed >= max_row:
+            self.row = max_row
             self.row_speed = 0
 
         self.column += self.column_speed
@@ -107,26 +123,25 @@ class Ship:
 
     def shoot(self):
         """create lasergun shot"""
-        coroutines.append(
-            fire(
-                self.canvas,
-                self.row,
-                self.column + self.current_frame.columns_size // 2,
-            )
+        self.projectiles.fire(
+            self.row, self.column + self.current_frame.columns_size // 2
         )
 
     async def check_collision(self):
-        """mark ship as destroyed if there is collision with obstacles"""
+        """mark ship as destroyed if there is collision with obstacles,
+        collisions of invulnerable ship are checked, but harmless"""
         while True:
-            for obstacle in obstacles:
-                if obstacle.has_collision(self.row, self.column, *self.size):
-                    logging.debug("Ship must be destroyed")
-                    self.destroyed = True
-                    await self.explode()
-                    return
+            collision = obstacles.find_collision(
+                self.row, self.column, *self.size, masks=self.masks
+            )
+            if collision is not None and not self.invulnerable:
+                logging.debug("Ship must be destroyed")
+                self.destroyed = True
+                await self.explode()
+                return
             await sleep(0)
 
 
-def new_ship(canvas, row, column, frames, explosion):
+def new_ship(canvas, row, column, frames, explosion, projectiles):
     """create new ship instance"""
-    return Ship(canvas, row, column, frames, explosion)
+    return Ship(canvas, row, column, frames, explosion, projectiles)
@@ -2,32 +2,184 @@
 
 import curses
 import random
+from array import array
 
-from core.constants import STARS
-from core.loop import sleep
+import settings
+from core.constants import (
+    STARS,
+    STARS_BLINK,
+    STARS_WHEEL_SIZE,
+    PARALLAX_SYMBOL,
+    PARALLAX_DENSITY,
+    PARALLAX_PERIOD,
+    TIC_TIMEOUT,
+    STARS_SHED_PRESSURE,
+)
+from core.loop import governor, sleep_ticks
 from utils import get_random_coordinates_list, rand
 
+# blink stages as attribute and duration in ticks, the same `sleep` waits
+_STAGES = [(attr, int(seconds // TIC_TIMEOUT) or 1) for attr, seconds in STARS_BLINK]
+# stage of blinking star which has not lit up yet
+_DARK = 255
 
-def get_stars_coroutines(canvas):
-    """return list of blinking coroutines"""
-    return [
-        blink(canvas, row, column, random.choice(STARS), rand(0, 1))
-        for row, column in get_random_coordinates_list(canvas)
-    ]
 
+class _Layer:
+    """stars `first` to `last` scrolling down one row per `period` ticks"""
 
-async def blink(canvas, row, column, symbol="*", delay=0):
-    """twinkle twinkle little star"""
-    await sleep(delay)
-    while True:
-        canvas.addstr(row, column, symbol, curses.A_DIM)
-        await sleep(2)
+    __slots__ = ("first", "last", "period", "offset", "next_shift")
 
-        canvas.addstr(row, column, symbol)
-        await sleep(0.3)
+    def __init__(self, first, last, period):
+        self.first = first
+        self.last = last
+        self.period = period
+        self.offset = 0
+        self.next_shift = period
 
-        canvas.addstr(row, column, symbol, curses.A_BOLD)
-        await sleep(0.5)
 
-        canvas.addstr(row, column, symbol)
-        await sleep(0.3)
+class Starfield:
+    """every star of the sky, blinking and scrolling in batches
+
+    star `i` is described by the i-th items of the arrays. Blinking star
+    stays in place and goes through the blink stages, it's kept in the
+    timing wheel slot of the tick its current stage ends on, so a tick
+    costs as much as the number of stars changing on it. Stars of parallax
+    layers don't blink, every layer scrolls down by one row per period.
+    When the canvas is resized stars are moved proportionally and lit ones
+    are drawn again.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.geometry = canvas.geometry
+        self.size = self.geometry.rows, self.geometry.columns
+        self.geometry.subscribe(self.resize)
+        self.rows = array("H")
+        self.columns = array("H")
+        self.symbols = []
+        self.stages = array("B")
+        self.wheel = [[] for _ in range(STARS_WHEEL_SIZE)]
+        self.blinking = []
+        self.layers = []
+        self.tick = 0
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _append(self, row, column, symbol):
+        self.rows.append(row)
+        self.columns.append(column)
+        self.symbols.append(symbol)
+        self.stages.append(0)
+        return len(self.symbols) - 1
+
+    def add_star(self, row, column, symbol="*", delay=0):
+        """add blinking star, it lights up after `delay` seconds"""
+        star = self._append(row, column, symbol)
+        self.stages[star] = _DARK
+        self.blinking.append(star)
+        delay_ticks = int(delay // TIC_TIMEOUT) or 1
+        self.wheel[(self.tick + delay_ticks) % STARS_WHEEL_SIZE].append(star)
+
+    def add_layer(self, coordinates, period):
+        """add parallax layer of stars, drawn right away"""
+        first = len(self)
+        for row, column in coordinates:
+            self._append(row, column, PARALLAX_SYMBOL)
+        layer = _Layer(first, len(self), period)
+        layer.next_shift = self.tick + period
+        self.layers.append(layer)
+        self._draw_layer(layer)
+
+    def _layer_row(self, layer, star):
+        return 1 + (self.rows[star] - 1 + layer.offset) % (self.geometry.rows - 2)
+
+    def _draw_layer(self, layer, symbol=None):
+        canvas, columns, symbols = self.canvas, self.columns, self.symbols
+        for star in range(layer.first, layer.last):
+            row = self._layer_row(layer, star)
+            canvas.addstr(row, columns[star], symbol or symbols[star], curses.A_DIM)
+
+    def resize(self, rows_number, columns_number):
+        """move stars into the resized canvas and draw them again"""
+        old_rows, old_columns = self.size
+        rows, columns = self.rows, self.columns
+        for star in range(len(self)):
+            rows[star] = _scale(rows[star], old_rows, rows_number)
+            columns[star] = _scale(columns[star], old_columns, columns_number)
+        self.size = rows_number, columns_number
+
+        for star in self.blinking:
+            stage = self.stages[star]
+            if stage == _DARK:
+                continue
+            attr, _ = _STAGES[stage - 1]
+            self.canvas.addstr(rows[star], columns[star], self.symbols[star], attr)
+        for layer in self.layers:
+            self._draw_layer(layer)
+
+    def step(self):
+        """update stars changing on the current tick
+        return number of ticks until the next change"""
+        canvas, wheel, tick = self.canvas, self.wheel, self.tick
+        rows, columns = self.rows, self.columns
+        symbols, stages = self.symbols, self.stages
+        slot = tick % STARS_WHEEL_SIZE
+        stars, wheel[slot] = wheel[slot], []
+        for star in stars:
+            stage = stages[star]
+            if stage == _DARK:
+                stage = 0
+            attr, duration = _STAGES[stage]
+            canvas.addstr(rows[star], columns[star], symbols[star], attr)
+            stages[star] = (stage + 1) % len(_STAGES)
+            wheel[(tick + duration) % STARS_WHEEL_SIZE].append(star)
+
+        for layer in self.layers:
+            if layer.next_shift <= tick:
+                self._draw_layer(layer, " ")
+                layer.offset += 1
+                layer.next_shift = tick + layer.period
+                self._draw_layer(layer)
+
+        return self._next_change()
+
+    def _next_change(self):
+        """ticks until the nearest stage end or layer scroll"""
+        tick, wheel = self.tick, self.wheel
+        ticks = STARS_WHEEL_SIZE
+        for layer in self.layers:
+            ticks = min(ticks, layer.next_shift - tick)
+        for distance in range(1, ticks):
+            if wheel[(tick + distance) % STARS_WHEEL_SIZE]:
+                return distance
+        return ticks
+
+    async def run(self):
+        """update stars whenever some of them change, under the load
+        pause for whole turns of the wheel, so stars keep their stages"""
+        while True:
+            if governor.pressure >= STARS_SHED_PRESSURE:
+                ticks = STARS_WHEEL_SIZE
+            else:
+                ticks = self.step()
+            await sleep_ticks(ticks)
+            self.tick += ticks
+
+
+def _scale(position, old_size, new_size):
+    """position inside canvas border after resize"""
+    return 1 + (position - 1) * max(new_size - 2, 1) // max(old_size - 2, 1)
+
+
+def new_starfield(canvas):
+    """starfield with random blinking stars and parallax layers"""
+    starfield = Starfield(canvas)
+    for row, column in get_random_coordinates_list(canvas):
+        starfield.add_star(row, column, random.choice(STARS), rand(0, 1))
+
+    count = canvas.geometry.rows * canvas.geometry.columns // PARALLAX_DENSITY
+    for layer in range(settings.PARALLAX_LAYERS):
+        coordinates = get_random_coordinates_list(canvas, count, count)
+        starfield.add_layer(coordinates, PARALLAX_PERIOD * (layer + 1))
+    return starfield
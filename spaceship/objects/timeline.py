@@ -2,8 +2,8 @@
 
 import dataclasses
 
+import settings
 from core.loop import sleep
-from settings import YEAR_IN_SECONDS
 
 
 @dataclasses.dataclass
@@ -15,7 +15,7 @@ class Timeline:
     async def run(self):
         """periodically increments the year"""
         while True:
-            await sleep(YEAR_IN_SECONDS)
+            await sleep(settings.YEAR_IN_SECONDS)
             self.year += 1
 
 
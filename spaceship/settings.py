@@ -8,5 +8,13 @@ LOG_LEVEL = logging.DEBUG if DEBUG else logging.INFO
 MIN_OBSTACLES_SPEED = 0.1
 MAX_OBSTACLES_SPEED = 0.2
 
+# slowly scrolling layers of dim stars behind the blinking ones
+PARALLAX_LAYERS = 0
+
+# spawn rate grows every year, it's capped by the shortest spawn interval
+# and the number of obstacles on the screen
+MIN_SPAWN_INTERVAL = 0.05
+MAX_OBSTACLES = 60
+
 YEAR_IN_SECONDS = 5
 SPACE_ERA_BEGINNING = 1957
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+"""long headless game sampling memory, tasks, obstacles, tick cost and
+backlog of the log queue, fails when any of them keeps growing
+
+the ship is invulnerable, so the whole game keeps running for hours. Logs
+go through the queue to the file like in the game.
+"""
+
+import argparse
+import ast
+import math
+import os
+import random
+import sys
+import tracemalloc
+from array import array
+
+import core.loop as loop
+import settings
+from batch import PILOTS, get_pilot
+from core import logs
+from core.constants import BASE_DIR, HEADLESS_ROWS, HEADLESS_COLUMNS, TIC_TIMEOUT
+from core.headless import HeadlessCanvas
+from main import create_coroutines
+from state import coroutines, obstacles
+
+HOUR_TICKS = round(3600 / TIC_TIMEOUT)
+
+# the largest growth of every metric per simulated hour, part of its mean,
+# measured tick cost is noisy
+MAX_SLOPES = {
+    "memory": 0.1,
+    "coroutines": 0.1,
+    "obstacles": 0.1,
+    "tick_cost": 0.5,
+    "log_queue": 0.1,
+}
+
+# growth counts only above this number of its standard errors, so jitter of
+# metrics is not taken for a trend
+NOISE_ALLOWANCE = 3
+# trends need this many samples after warmup, over this many simulated seconds
+MIN_SAMPLES = 10
+MIN_SPAN = 1800
+
+# the debug overlay is off and years pass ten times faster
+SOAK_SETTINGS = {"DEBUG": False, "YEAR_IN_SECONDS": 0.5}
+
+
+class Soak:
+    """metrics of the running game taken every `interval` ticks
+
+    arrays for `count` samples are allocated up front, so the samples
+    themselves don't add up to the traced memory. Sample `i` is the i-th
+    item of `ticks` and of every array of `metrics`. `records` is the queue
+    of log records the listener writes, its size is the log backlog.
+    """
+
+    def __init__(self, interval, count, records=None):
+        self.interval = interval
+        self.records = records
+        self.ticks = array("l", [0]) * count
+        self.metrics = {name: array("d", [0]) * count for name in MAX_SLOPES}
+        self.taken = 0
+        self.played = 0
+
+    def sample(self, tick):
+        """take metrics unless the arrays are full"""
+        taken, metrics = self.taken, self.metrics
+        if taken == len(self.ticks):
+            return
+        self.ticks[taken] = tick
+        metrics["memory"][taken], _ = tracemalloc.get_traced_memory()
+        metrics["coroutines"][taken] = len(coroutines)
+        metrics["obstacles"][taken] = len(obstacles)
+        metrics["tick_cost"][taken] = loop.clock.tick_cost
+        if self.records is not None:
+            metrics["log_queue"][taken] = self.records.qsize()
+        self.taken = taken + 1
+
+    async def run(self):
+        """sample the game until it's cancelled"""
+        while True:
+            await loop.sleep_ticks(self.interval)
+            self.sample(loop.clock.tick)
+
+    def fitted(self, warmup=0):
+        """indexes of samples taken after `warmup` ticks"""
+        ticks = self.ticks
+        return [index for index in range(self.taken) if ticks[index] >= warmup]
+
+    def trends(self, warmup=0):
+        """growth of every metric per simulated hour as part of its mean
+        and the standard error of it, least squares over the samples after
+        `warmup` ticks"""
+        ticks, fitted = self.ticks, self.fitted(warmup)
+        trends = {}
+        for name, values in self.metrics.items():
+            points = [(ticks[index], values[index]) for index in fitted]
+            mean = sum(value for _, value in points) / len(points) if points else 0
+            scale = HOUR_TICKS / mean if mean else 0.0
+            growth, error = fit(points)
+            trends[name] = growth * scale, error * scale
+        return trends
+
+
+def fit(points):
+    """least squares slope of (x, y) points and its standard error,
+    zeros for less than three points"""
+    count = len(points)
+    if count < 3:
+        return 0.0, 0.0
+    mean_x = sum(x for x, _ in points) / count
+    mean_y = sum(y for _, y in points) / count
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return 0.0, 0.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+    residuals = sum((y - mean_y - slope * (x - mean_x)) ** 2 for x, y in points)
+    return slope, math.sqrt(residuals / (count - 2) / variance)
+
+
+def failed_trends(trends, max_slopes):
+    """names of metrics surely growing faster than allowed"""
+    return [
+        name
+        for name, (growth, error) in trends.items()
+        if growth - NOISE_ALLOWANCE * error > max_slopes[name]
+    ]
+
+
+def play_soak(ticks, interval, rows, columns, seed, pilot, records=None):
+    """play headless game with invulnerable ship for `ticks` ticks, return
+    its Soak, `played` ticks are less if the game ended early"""
+    random.seed(seed)
+    canvas = HeadlessCanvas(rows, columns)
+    loop.clock.capped = False
+    soak = Soak(interval, ticks // interval, records)
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        ship, _, _ = create_coroutines(canvas, get_pilot(pilot)(seed))
+        ship.invulnerable = True
+        coroutines.spawn(soak.run(), "soak")
+        loop.run(canvas, coroutines, ticks)
+    except SystemExit:
+        pass  # the game called exit, it's reported as ended early
+    finally:
+        soak.played = loop.clock.tick
+        for task in list(coroutines.tasks):
+            task.cancel()
+        if started:
+            tracemalloc.stop()
+    return soak
+
+
+def print_report(soak, trends, max_slopes):
+    """first and last samples, trends and limits of every metric"""
+    last = soak.taken - 1
+    print(f"samples: {soak.taken}, ticks {soak.ticks[0]} to {soak.ticks[last]}")
+    print(
+        f"{'metric':<12} {'first':>12} {'last':>12} {'growth/h':>12}"
+        f" {'error':>12} {'limit':>12}"
+    )
+    failed = failed_trends(trends, max_slopes)
+    for name, (growth, error) in trends.items():
+        print(
+            f"{name:<12} {soak.metrics[name][0]:>12.6g}"
+            f" {soak.metrics[name][last]:>12.6g} {growth:>12.6g} {error:>12.6g}"
+            f" {max_slopes[name]:>12.6g} {'FAIL' if name in failed else 'ok'}"
+        )
+    print(obstacles.stats())
+
+
+def parse_pair(text):
+    """NAME=VALUE into name and value"""
+    name, _, value = text.partition("=")
+    if not value:
+        raise argparse.ArgumentTypeError(f"no value: {text}")
+    return name, ast.literal_eval(value)
+
+
+def parse_args():
+    """command line arguments"""
+    parser = argparse.ArgumentParser(description="Spaceship soak test")
+    parser.add_argument(
+        "--hours", type=float, default=1, help="simulated hours of the game"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=60, help="simulated seconds per sample"
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=600, help="simulated seconds not in trends"
+    )
+    parser.add_argument(
+        "--min-span",
+        type=float,
+        default=MIN_SPAN,
+        help="simulated seconds after warmup trends need",
+    )
+    parser.add_argument("--rows", type=int, default=HEADLESS_ROWS)
+    parser.add_argument("--columns", type=int, default=HEADLESS_COLUMNS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--log",
+        default=os.path.join(BASE_DIR, "../spaceship.log"),
+        help="file the game logs into",
+    )
+    parser.add_argument(
+        "--pilot", default="random", help=f"{', '.join(PILOTS)} or module:attribute"
+    )
+    parser.add_argument(
+        "--set",
+        dest="settings",
+        action="append",
+        type=parse_pair,
+        default=[],
+        metavar="NAME=VALUE",
+        help="change setting, may be repeated",
+    )
+    parser.add_argument(
+        "--max-slope",
+        dest="max_slopes",
+        action="append",
+        type=parse_pair,
+        default=[],
+        metavar="NAME=VALUE",
+        help=f"largest growth per hour as part of the mean of {', '.join(MAX_SLOPES)},"
+        " may be repeated",
+    )
+    args = parser.parse_args()
+    for name, _ in args.settings:
+        if not hasattr(settings, name):
+            parser.error(f"unknown setting: {name}")
+    for name, _ in args.max_slopes:
+        if name not in MAX_SLOPES:
+            parser.error(f"unknown metric: {name}")
+    args.settings = dict(SOAK_SETTINGS, **dict(args.settings))
+    args.max_slopes = dict(MAX_SLOPES, **dict(args.max_slopes))
+    return args
+
+
+def main():
+    """play long game, print trends, exit with 1 if any metric grows"""
+    args = parse_args()
+    for name, value in args.settings.items():
+        setattr(settings, name, value)
+    ticks = round(args.hours * HOUR_TICKS)
+    interval = max(round(args.interval / TIC_TIMEOUT), 1)
+    warmup = round(args.warmup / TIC_TIMEOUT)
+    span = max(ticks - warmup, 0)
+    fitted = span // interval
+    if fitted < MIN_SAMPLES or span * TIC_TIMEOUT < args.min_span:
+        sys.exit(
+            f"too short for trends: {fitted} samples over"
+            f" {span * TIC_TIMEOUT:.0f}s after warmup, at least"
+            f" {MIN_SAMPLES} samples over {args.min_span:.0f}s are needed"
+        )
+    listener = logs.setup(args.log, settings.LOG_LEVEL)
+    try:
+        soak = play_soak(
+            ticks,
+            interval,
+            args.rows,
+            args.columns,
+            args.seed,
+            args.pilot,
+            listener.queue,
+        )
+    finally:
+        listener.stop()
+    if soak.played < ticks:
+        sys.exit(f"the game ended early on tick {soak.played} of {ticks}")
+    trends = soak.trends(warmup)
+    print_report(soak, trends, args.max_slopes)
+    sys.exit(1 if failed_trends(trends, args.max_slopes) else 0)
+
+
+if __name__ == "__main__":
+    main()
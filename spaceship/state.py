@@ -2,5 +2,9 @@
 
 # pylint: disable=C0103
 
-coroutines = []
-obstacles = []
+from core.loop import RunQueue
+from core.registry import ObstacleRegistry
+from core.spatial import Grid
+
+coroutines = RunQueue()
+obstacles = ObstacleRegistry(Grid())
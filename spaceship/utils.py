@@ -1,35 +1,13 @@
 """utils and helpers"""
 
-import os
 import random
 
-from core.constants import (
-    SPACESHIP_FRAMES_DIR,
-    EXPLOSION_FRAMES_DIR,
-    GARBAGE_FRAMES_DIR,
-    BASE_DIR,
-)
+from core.assets import load_frames
 
 
 def read_all_frames():
-    """read frames from files"""
-    frames = {
-        "spaceship": read_frames(SPACESHIP_FRAMES_DIR),
-        "explosion": read_frames(EXPLOSION_FRAMES_DIR),
-        "garbage": read_frames(GARBAGE_FRAMES_DIR),
-    }
-    with open(os.path.join(BASE_DIR, "frames", "gameover.txt")) as f_d:
-        frames["gameover"] = f_d.read()
-    return frames
-
-
-def read_frames(frames_dir):
-    """read all frame files from directory into list of strings"""
-    frames = []
-    for filename in sorted(os.listdir(frames_dir)):
-        with open(os.path.join(frames_dir, filename)) as f_d:
-            frames.append(f_d.read())
-    return frames
+    """read precompiled frames from the bundle"""
+    return load_frames()
 
 
 def get_random_coordinates_list(canvas, low=50, high=100):
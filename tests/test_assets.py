@@ -0,0 +1,40 @@
+from core import assets
+from objects.frame import Sprite
+
+
+def read(path):
+    with open(path) as f_d:
+        return f_d.read()
+
+
+def test_bundled_sprites_match_compiled_text(tmp_path):
+    path = str(tmp_path / "frames.bundle")
+    frames = assets.load_frames(path)
+    sources = assets._source_files()
+    assert frames["gameover"].text == read(sources["gameover"][0])
+    for group in ("spaceship", "explosion", "garbage"):
+        assert len(frames[group]) == len(sources[group])
+        for bundled, source_path in zip(frames[group], sources[group]):
+            expected = Sprite(read(source_path))
+            assert bundled.rows_size == expected.rows_size
+            assert bundled.columns_size == expected.columns_size
+            assert bundled.runs == expected.runs
+            assert bundled.masks == expected.masks
+            assert bundled.text == expected.text
+
+
+def test_stale_bundle_is_rebuilt(tmp_path):
+    path = str(tmp_path / "frames.bundle")
+    sources = assets._source_files()
+    assets.compile_bundle(sources, [["stale", 0, 0]], path)
+
+    assets.load_frames(path)
+    index, _ = assets._open_bundle(path)
+    assert index["fingerprint"] == assets._fingerprint(sources)
+
+
+def test_broken_bundle_is_rebuilt(tmp_path):
+    path = tmp_path / "frames.bundle"
+    path.write_bytes(b"junk")
+    frames = assets.load_frames(str(path))
+    assert frames["garbage"]
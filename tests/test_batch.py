@@ -0,0 +1,59 @@
+import pytest
+
+import batch
+import settings
+
+
+def test_pilots_are_reproducible():
+    first, second = batch.RandomPilot(3), batch.RandomPilot(3)
+    assert [first(None) for _ in range(100)] == [second(None) for _ in range(100)]
+    assert all(shoot for _, _, shoot in map(batch.GunnerPilot(3), [None] * 10))
+
+
+def test_pilot_by_path():
+    assert batch.get_pilot("idle") is batch.IdlePilot
+    assert batch.get_pilot("batch:GunnerPilot") is batch.GunnerPilot
+
+
+@pytest.fixture
+def game(monkeypatch):
+    for name in ("DEBUG", "MAX_OBSTACLES_SPEED"):
+        monkeypatch.setattr(settings, name, getattr(settings, name))
+    return {
+        "settings": {"DEBUG": False, "MAX_OBSTACLES_SPEED": 1},
+        "pilot": "gunner",
+        "seed": 1,
+        "ticks": 3000,
+        "rows": 20,
+        "columns": 60,
+    }
+
+
+def test_play_game(game):
+    result = batch.play_game(game)
+    assert settings.MAX_OBSTACLES_SPEED == 1
+    assert result["crashed"]
+    assert 0 < result["ticks"] < 3000
+    assert result["year"] >= settings.SPACE_ERA_BEGINNING
+    assert result["shots"] > 0
+    assert result["spawned"] > 0
+    assert batch.play_game(game) == dict(result, tick_cost=pytest.approx(1, abs=1))
+
+
+def test_aggregate():
+    results = [
+        {"settings": {"DEBUG": False, "YEAR_IN_SECONDS": 5}, "pilot": "idle"},
+        {"settings": {"DEBUG": False, "YEAR_IN_SECONDS": 5}, "pilot": "idle"},
+        {"settings": {"DEBUG": False, "YEAR_IN_SECONDS": 2}, "pilot": "idle"},
+    ]
+    for number, result in enumerate(results):
+        result.update(crashed=True, year=1960 + number, spawned=2, destroyed=1)
+        result.update(shots=4, tick_cost=0.001)
+    report = batch.aggregate(results)
+    assert [line["settings"] for line in report] == [
+        {"YEAR_IN_SECONDS": 2},
+        {"YEAR_IN_SECONDS": 5},
+    ]
+    assert report[1]["games"] == 2
+    assert report[1]["year_mean"] == 1960.5
+    assert report[1]["shots_mean"] == 4
@@ -0,0 +1,59 @@
+from core.compositor import Compositor
+
+
+class Window:
+    def __init__(self, rows=5, columns=10):
+        self.size = rows, columns
+        self.calls = []
+
+    def getmaxyx(self):
+        return self.size
+
+    def addstr(self, *args):
+        self.calls.append(args)
+
+    def border(self):
+        self.calls.append("border")
+
+    def refresh(self):
+        pass
+
+
+def test_only_changed_cells_are_written():
+    window = Window()
+    canvas = Compositor(window)
+    canvas.addstr(1, 2, "abc")
+    canvas.refresh()
+    assert window.calls == [(1, 2, "abc", 0)]
+
+    window.calls.clear()
+    canvas.addstr(1, 2, "   ")
+    canvas.addstr(1, 2, "aXc")
+    canvas.refresh()
+    assert window.calls == [(1, 3, "X", 0)]
+
+    window.calls.clear()
+    canvas.addstr(1, 2, "aXc")
+    canvas.refresh()
+    assert window.calls == []
+
+
+def test_attribute_change_is_written():
+    window = Window()
+    canvas = Compositor(window)
+    canvas.addstr(2, 0, "**")
+    canvas.refresh()
+    window.calls.clear()
+    canvas.addstr(2, 0, "**", 8)
+    canvas.refresh()
+    assert window.calls == [(2, 0, "**", 8)]
+
+
+def test_clipping_and_lower_right_corner():
+    window = Window(rows=3, columns=4)
+    canvas = Compositor(window)
+    canvas.addstr(2, -1, "abcdef")
+    canvas.addstr(3, 0, "x")
+    canvas.border()
+    canvas.refresh()
+    assert window.calls == [(2, 0, "bcd", 0), "border"]
@@ -0,0 +1,74 @@
+import glob
+import os
+
+import pytest
+
+from core.constants import BASE_DIR
+from core.geometry import Geometry
+from curses_tools import draw_frame, get_frame_runs
+
+
+class CellsCanvas:
+    def __init__(self, rows, columns):
+        self.size = rows, columns
+        self.geometry = Geometry(rows, columns)
+        self.cells = {}
+        self.calls = 0
+
+    def getmaxyx(self):
+        return self.size
+
+    def addch(self, row, column, symbol):
+        self.calls += 1
+        self.cells[row, column] = symbol
+
+    def addstr(self, row, column, text):
+        self.calls += 1
+        rows, columns = self.size
+        assert 0 <= row < rows and 0 <= column and column + len(text) <= columns
+        assert (row, column + len(text)) != (rows - 1, columns)
+        for offset, symbol in enumerate(text):
+            self.cells[row, column + offset] = symbol
+
+
+def draw_frame_by_symbol(canvas, start_row, start_column, text, negative=False):
+    """reference implementation, one addch per symbol"""
+    rows_number, columns_number = canvas.getmaxyx()
+    for row, line in enumerate(text.splitlines(), round(start_row)):
+        if row < 0:
+            continue
+        if row >= rows_number:
+            break
+        for column, symbol in enumerate(line, round(start_column)):
+            if column < 0:
+                continue
+            if column >= columns_number:
+                break
+            if symbol == " ":
+                continue
+            if row == rows_number - 1 and column == columns_number - 1:
+                continue
+            canvas.addch(row, column, symbol if not negative else " ")
+
+
+FRAMES = sorted(
+    glob.glob(os.path.join(BASE_DIR, "frames", "**", "*.txt"), recursive=True)
+)
+POSITIONS = [(0, 0), (5.4, 7.6), (-3, -4), (12, 25), (18, 36)]
+
+
+@pytest.mark.parametrize("path", FRAMES, ids=os.path.basename)
+@pytest.mark.parametrize("position", POSITIONS)
+@pytest.mark.parametrize("negative", [False, True])
+def test_draw_frame_matches_symbol_by_symbol_drawing(path, position, negative):
+    with open(path) as f_d:
+        text = f_d.read()
+    expected, actual = CellsCanvas(20, 40), CellsCanvas(20, 40)
+    draw_frame_by_symbol(expected, *position, text, negative)
+    draw_frame(actual, *position, text, negative)
+    assert actual.cells == expected.cells
+    assert actual.calls <= expected.calls
+
+
+def test_runs():
+    assert get_frame_runs(" ab  c\n\nd") == [(0, 1, "ab"), (0, 5, "c"), (2, 0, "d")]
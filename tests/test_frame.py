@@ -15,3 +15,8 @@ def test_override(row_column, expected):
     frame_instance = frame.Frame(None, " ", 2, 2)
     result = frame_instance._override_row_and_column(*row_column)
     assert result == expected
+
+
+def test_row_masks():
+    sprite = frame.Sprite(" ab  c\n\n  d")
+    assert sprite.masks == (0b100110, 0b0, 0b100)
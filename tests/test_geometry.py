@@ -0,0 +1,86 @@
+import curses
+
+from core.compositor import Compositor
+from core.geometry import Geometry
+from core.headless import HeadlessCanvas
+from core.loop import RunQueue
+from curses_tools import read_controls, key_handlers
+from objects.stars import Starfield
+
+
+def test_subscribers_are_told_about_changes_only():
+    geometry = Geometry(10, 20)
+    sizes = []
+    geometry.subscribe(lambda rows, columns: sizes.append((rows, columns)))
+    assert not geometry.resize(10, 20)
+    assert geometry.resize(12, 30)
+    assert sizes == [(12, 30)]
+    assert (geometry.rows, geometry.columns) == (12, 30)
+
+
+class Window:
+    def __init__(self):
+        self.size = 5, 10
+        self.calls = []
+
+    def getmaxyx(self):
+        return self.size
+
+    def addstr(self, *args):
+        self.calls.append(args)
+
+    def erase(self):
+        self.calls.append("erase")
+
+    def refresh(self):
+        pass
+
+
+def test_compositor_resize_on_key(monkeypatch):
+    window = Window()
+    canvas = Compositor(window)
+    canvas.addstr(1, 1, "ab")
+    canvas.refresh()
+    monkeypatch.setitem(key_handlers, curses.KEY_RESIZE, canvas.update_size)
+    window.size = 8, 12
+    window.calls.clear()
+    canvas.getch = lambda keys=[curses.KEY_RESIZE]: keys.pop() if keys else -1
+    read_controls(canvas)
+    assert canvas.getmaxyx() == (8, 12)
+    assert window.calls == ["erase"]
+    canvas.addstr(7, 10, "c")
+    canvas.refresh()
+    assert window.calls[-1] == (7, 10, "c", 0)
+
+
+def test_headless_resize_reaches_compositor(monkeypatch):
+    window = HeadlessCanvas(20, 40, keys=[[], [curses.KEY_RESIZE]])
+    canvas = Compositor(window)
+    monkeypatch.setitem(key_handlers, curses.KEY_RESIZE, canvas.update_size)
+    canvas.addstr(1, 1, "ab")
+    canvas.refresh()
+    window.resize(25, 50)
+    read_controls(canvas)
+    assert canvas.getmaxyx() == (25, 50)
+    assert window.dump() == [" " * 50] * 25
+    canvas.addstr(24, 48, "c")
+    canvas.refresh()
+    assert window.cell(24, 48)[0] == "c"
+    read_controls(canvas)
+    assert canvas.getmaxyx() == (25, 50)
+
+
+def test_stars_move_into_resized_canvas():
+    canvas = HeadlessCanvas(12, 22)
+    starfield = Starfield(canvas)
+    starfield.add_star(10, 20, "+")
+    starfield.add_star(1, 1, ":")
+    queue = RunQueue()
+    queue.spawn(starfield.run())
+    for tick in range(3):
+        queue.step(tick)
+    canvas.resize(7, 12)
+    assert list(zip(starfield.rows, starfield.columns)) == [(5, 10), (1, 1)]
+    assert canvas.cell(5, 10)[0] == "+"
+    canvas.resize(12, 22)
+    assert list(zip(starfield.rows, starfield.columns)) == [(9, 19), (1, 1)]
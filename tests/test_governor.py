@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+from core.governor import Governor
+
+
+def clock(tick, tick_cost):
+    return SimpleNamespace(tick=tick, tick_cost=tick_cost, tick_timeout=0.01)
+
+
+def test_pressure_rises_and_drops_one_level_per_interval():
+    governor = Governor(budget=0.5, relief=0.5, interval=10, adaptive=True)
+    for tick in range(30):
+        governor.update(clock(tick, 0.008))
+    assert governor.pressure == 3
+    for tick in range(30, 40):
+        governor.update(clock(tick, 0.004))
+    assert governor.pressure == 3  # between relief and budget
+    for tick in range(40, 60):
+        governor.update(clock(tick, 0.001))
+    assert governor.pressure == 1
+    assert governor.peak_pressure == 3
+
+
+def test_pressure_is_limited():
+    governor = Governor(interval=1, max_pressure=2, adaptive=True)
+    for tick in range(10):
+        governor.update(clock(tick, 1))
+    assert governor.pressure == 2
+
+
+def test_not_adaptive_governor_ignores_load():
+    governor = Governor(interval=1)
+    for tick in range(10):
+        governor.update(clock(tick, 1))
+    assert governor.pressure == 0
+    assert governor.cap(60) == 60
+
+
+def test_spawn_cap():
+    governor = Governor()
+    assert governor.may_spawn(59, 60)
+    assert not governor.may_spawn(60, 60)
+    governor.pressure = 3
+    assert governor.cap(60) == 30
+    governor.pressure = 4
+    assert not governor.may_spawn(15, 60)
+    assert governor.stats() == {
+        "pressure": 4,
+        "peak_pressure": 0,
+        "spawn_cap": 15,
+        "throttled": 2,
+    }
@@ -0,0 +1,32 @@
+import curses
+
+import pytest
+
+from core.headless import HeadlessCanvas
+from curses_tools import read_controls, UP_KEY_CODE, SPACE_KEY_CODE
+
+
+def test_drawing_and_dump():
+    canvas = HeadlessCanvas(3, 5)
+    canvas.addstr(1, 1, "ab", curses.A_BOLD)
+    canvas.addch(0, 4, "x")
+    assert canvas.dump() == ["    x", " ab  ", "     "]
+    assert canvas.cell(1, 2) == ("b", curses.A_BOLD)
+
+
+@pytest.mark.parametrize("row,column,text", [(3, 0, "a"), (0, 4, "ab"), (2, 4, "a")])
+def test_writing_out_of_canvas_fails(row, column, text):
+    canvas = HeadlessCanvas(3, 5)
+    with pytest.raises(curses.error):
+        canvas.addstr(row, column, text)
+
+
+def test_scripted_keys():
+    canvas = HeadlessCanvas(keys=[[UP_KEY_CODE, SPACE_KEY_CODE], [], [UP_KEY_CODE]])
+    assert read_controls(canvas) == (-1, 0, True)
+    canvas.refresh()
+    assert read_controls(canvas) == (0, 0, False)
+    canvas.refresh()
+    assert read_controls(canvas) == (-1, 0, False)
+    canvas.refresh()
+    assert canvas.getch() == -1
@@ -0,0 +1,34 @@
+import logging
+
+import pytest
+
+from core import logs
+
+
+def test_sampler_lets_through_one_event_per_interval():
+    sampler = logs.Sampler(interval=3)
+    assert [sampler(tick) for tick in range(7)] == [
+        True,
+        False,
+        False,
+        True,
+        False,
+        False,
+        True,
+    ]
+
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    root.handlers, root.level = handlers, level
+
+
+def test_records_are_written_by_listener(root_logger, tmp_path):
+    path = tmp_path / "game.log"
+    listener = logs.setup(path, logging.DEBUG)
+    logging.debug("tick %d", 60)
+    listener.stop()
+    assert path.read_text() == "DEBUG:root:tick 60\n"
@@ -0,0 +1,347 @@
+import os
+import signal
+
+import pytest
+
+from core import loop
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_time():
+    return FakeTime()
+
+
+@pytest.fixture
+def clock(fake_time):
+    instance = loop.Clock(
+        tick_timeout=0.1,
+        max_catchup=3,
+        time_func=fake_time.time,
+        sleep_func=fake_time.sleep,
+    )
+    instance.start()
+    return instance
+
+
+def test_work_is_subtracted_from_sleep(clock, fake_time):
+    fake_time.now += 0.03
+    clock.wait()
+    assert fake_time.slept == [pytest.approx(0.07)]
+    assert clock.overruns == 0
+
+
+def test_late_ticks_run_without_sleep(clock, fake_time):
+    fake_time.now += 0.25
+    clock.wait()
+    clock.wait()
+    assert fake_time.slept == []
+    clock.wait()
+    assert fake_time.slept == [pytest.approx(0.05)]
+    assert clock.overruns == 2
+    assert clock.skipped == 0
+
+
+def test_ticks_are_skipped_when_too_late(clock, fake_time):
+    fake_time.now += 1.05
+    clock.wait()
+    assert clock.skipped == 9
+    clock.wait()
+    assert fake_time.slept == [pytest.approx(0.1)]
+
+
+def test_stats(clock, fake_time):
+    for _ in range(10):
+        fake_time.now += 0.02
+        clock.wait()
+    stats = clock.stats()
+    assert stats["tick"] == 10
+    assert stats["tick_rate"] == pytest.approx(10)
+    assert stats["tick_cost"] == pytest.approx(0.02)
+    assert stats["jitter"] == pytest.approx(0)
+
+
+class FakeCanvas:
+    def refresh(self):
+        pass
+
+    def border(self):
+        pass
+
+
+@pytest.fixture
+def loop_clock(monkeypatch, fake_time):
+    instance = loop.Clock(time_func=fake_time.time, sleep_func=fake_time.sleep)
+    monkeypatch.setattr(loop, "clock", instance)
+    return instance
+
+
+class SendCounter:
+    """coroutine proxy counting resumes"""
+
+    def __init__(self, coro, clock):
+        self.coro = coro
+        self.clock = clock
+        self.ticks = []
+
+    def send(self, value):
+        self.ticks.append(self.clock.tick)
+        return self.coro.send(value)
+
+    def close(self):
+        self.coro.close()
+
+
+async def ticker(ticks):
+    for _ in range(ticks):
+        await loop.sleep(0)
+
+
+def test_sleeping_coroutine_is_parked(loop_clock):
+    async def sleeper():
+        await loop.sleep(0.5)
+
+    queue = loop.RunQueue()
+    coro = SendCounter(sleeper(), loop_clock)
+    queue.extend([coro, ticker(60)])
+    loop.run(FakeCanvas(), queue)
+    assert coro.ticks == [0, int(0.5 // loop.TIC_TIMEOUT)]
+
+
+def test_spawned_task_starts_on_next_tick():
+    queue = loop.RunQueue()
+    started = []
+
+    async def child():
+        started.append("child")
+
+    async def parent():
+        queue.spawn(child())
+        await loop.sleep(0)
+        started.append("parent")
+
+    queue.spawn(parent())
+    queue.step(0)
+    assert started == []
+    queue.step(1)
+    assert started == ["parent", "child"]
+    assert len(queue) == 0
+
+
+def test_cancel_from_outside():
+    queue = loop.RunQueue()
+    task = queue.spawn(ticker(10))
+    queue.step(0)
+    task.cancel()
+    assert task.done and task.cancelled
+    assert len(queue) == 0
+    queue.step(1)
+    assert task.coro.cr_frame is None
+
+
+def test_cancelled_tasks_are_not_parked():
+    queue = loop.RunQueue()
+    tasks = queue.extend([loop.sleep(1) for _ in range(3)])
+    queue.step(0)
+    assert queue.parked == 3
+    tasks[0].cancel()
+    assert queue.parked == 2
+
+
+def test_cancel_itself():
+    queue = loop.RunQueue()
+    tasks = []
+
+    async def suicide():
+        tasks[0].cancel()
+        await loop.sleep(0)
+        raise AssertionError("resumed after cancel")
+
+    tasks.append(queue.spawn(suicide()))
+    queue.step(0)
+    queue.step(1)
+    assert len(queue) == 0
+
+
+class FakeInput:
+    """input arriving after `delay` seconds of waiting"""
+
+    def __init__(self, fake_time, delay=None):
+        self.fake_time = fake_time
+        self.delay = delay
+        self.waited = []
+
+    def __call__(self, timeout):
+        self.waited.append(timeout)
+        if timeout is None:
+            self.fake_time.now += self.delay
+            self.delay = None
+            return True
+        if self.delay is not None and self.delay <= timeout:
+            self.fake_time.now += self.delay
+            self.delay = None
+            return True
+        self.fake_time.now += timeout
+        return False
+
+
+def test_ticks_without_work_pass_idle(clock, fake_time):
+    clock.input_func = FakeInput(fake_time)
+    assert clock.wait(until=10) is False
+    assert clock.tick == 10
+    assert clock.input_func.waited == [pytest.approx(1)]
+    assert fake_time.slept == []
+
+
+def test_input_makes_tick_due_at_once(clock, fake_time):
+    clock.input_func = FakeInput(fake_time, delay=0.35)
+    assert clock.wait(until=10) is True
+    assert clock.tick == 3
+    assert fake_time.now == pytest.approx(100.35)
+    clock.input_func.delay = 0
+    assert clock.wait() is True
+    # unread input is not awaited, tick 4 is due on schedule
+    assert fake_time.slept == [pytest.approx(0.05)]
+
+
+def test_no_work_waits_for_input_without_timeout(clock, fake_time):
+    clock.input_func = FakeInput(fake_time, delay=100.05)
+    assert clock.wait() is True
+    assert clock.input_func.waited == [None]
+    assert clock.tick == 1000
+    clock.wait(until=clock.tick + 1)
+    assert fake_time.now == pytest.approx(200.1)
+
+
+class RepeatingInput:
+    """key autorepeat, a key every `period` seconds, read at once"""
+
+    def __init__(self, fake_time, period):
+        self.fake_time = fake_time
+        self.period = period
+        self.next_key = fake_time.now + period
+
+    def __call__(self, timeout):
+        now = self.fake_time.now
+        if timeout is not None and self.next_key > now + timeout:
+            self.fake_time.now += timeout
+            return False
+        self.fake_time.now = max(now, self.next_key)
+        self.next_key += self.period
+        return True
+
+
+@pytest.mark.parametrize("period", [None, 1 / 25, 1 / 40])
+def test_steady_input_keeps_game_speed(loop_clock, fake_time, period):
+    if period is not None:
+        loop_clock.input_func = RepeatingInput(fake_time, period)
+    loop_clock.start()
+    while fake_time.now < 110:
+        loop_clock.wait(loop_clock.tick + 1)
+    assert loop_clock.tick == pytest.approx(600, abs=1)
+
+
+def test_input_waiting_task():
+    queue = loop.RunQueue()
+    keys = []
+
+    async def reader():
+        while True:
+            await loop.wait_input()
+            keys.append(len(keys))
+
+    queue.spawn(reader())
+    queue.step(0)
+    assert queue.next_tick(0) is None
+    queue.step(1, input_ready=False)
+    assert keys == []
+    queue.step(2, input_ready=True)
+    assert keys == [0]
+    queue.spawn(ticker(1))
+    assert queue.next_tick(2) == 3
+    queue.step(3, input_ready=False)
+    assert keys == [0]
+    assert queue.next_tick(3) == 4
+
+
+def test_suspended_task():
+    queue = loop.RunQueue()
+    resumed = []
+
+    async def sleeper():
+        while True:
+            await loop.suspend()
+            resumed.append(len(resumed))
+
+    task = queue.spawn(sleeper())
+    task.resume()  # not suspended yet
+    queue.step(0)
+    assert queue.next_tick(0) is None
+    queue.step(1)
+    assert resumed == []
+    task.resume()
+    task.resume()
+    queue.step(2)
+    assert resumed == [0]
+    assert queue.next_tick(2) is None
+
+
+def test_signal_wakes_input_selector():
+    read_end, write_end = os.pipe()
+    previous = signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+    with os.fdopen(read_end) as file:
+        selector = loop.InputSelector(file, signals=(signal.SIGUSR1,))
+        try:
+            assert selector(0) is False
+            os.kill(os.getpid(), signal.SIGUSR1)
+            assert selector(1) is True
+            assert selector.signalled
+            assert selector(0) is False
+        finally:
+            selector.close()
+            assert signal.getsignal(signal.SIGUSR1) == signal.SIG_IGN
+            assert signal.set_wakeup_fd(-1) == -1
+            signal.signal(signal.SIGUSR1, previous)
+    os.close(write_end)
+
+
+class SlowCanvas(FakeCanvas):
+    def __init__(self, fake_time, refresh_cost):
+        self.fake_time = fake_time
+        self.refresh_cost = refresh_cost
+
+    def refresh(self):
+        self.fake_time.now += self.refresh_cost
+
+
+@pytest.mark.parametrize("refresh_cost,interval", [(0.002, 1), (0.01, 2), (0.03, 4)])
+def test_slow_terminal_does_not_slow_game_down(
+    monkeypatch, loop_clock, fake_time, refresh_cost, interval
+):
+    pacer = loop.FramePacer(time_func=fake_time.time)
+    monkeypatch.setattr(loop, "pacer", pacer)
+    queue = loop.RunQueue()
+    queue.spawn(ticker(1000))
+    loop.run(SlowCanvas(fake_time, refresh_cost), queue, 600)
+    assert fake_time.now - 100 == pytest.approx(10, abs=0.1)
+    assert loop_clock.skipped == 0
+    assert pacer.interval == interval
+    assert pacer.rendered == pytest.approx(600 / interval, abs=2)
+
+
+def test_uncapped_loop_refreshes_every_tick(clock):
+    pacer = loop.FramePacer()
+    clock.capped = False
+    assert all(pacer.render(FakeCanvas(), clock) for _ in range(10))
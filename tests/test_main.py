@@ -0,0 +1,60 @@
+import curses
+
+import pytest
+
+import core.loop as loop
+import main
+import settings
+from core.headless import HeadlessCanvas
+from state import coroutines, obstacles
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 100.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class Parked(Exception):
+    """the loop waits for input without timeout"""
+
+
+def test_game_over_screen_parks_the_loop(monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", False)
+    monkeypatch.setattr(curses, "beep", lambda: None)
+    fake_time = FakeTime()
+    waited = []
+    ship = None
+
+    def input_func(timeout):
+        if ship.destroyed:
+            waited.append(timeout)
+        if timeout is None:
+            raise Parked
+        fake_time.now += timeout
+        return False
+
+    clock = loop.Clock(
+        time_func=fake_time.time, sleep_func=fake_time.sleep, input_func=input_func
+    )
+    monkeypatch.setattr(loop, "clock", clock)
+    canvas = HeadlessCanvas(20, 60)
+    ship, _, _ = main.create_coroutines(canvas, lambda canvas: (0, 0, False))
+    # the ship starts inside the obstacle, so the game is over at once
+    index = obstacles.add(0, 0, 20, 60)
+    try:
+        with pytest.raises(Parked):
+            loop.run(canvas, coroutines, 3000)
+    finally:
+        obstacles.remove(index)
+        for task in list(coroutines.tasks):
+            task.cancel()
+    assert ship.destroyed
+    # the explosion ends, then nothing wakes the loop up
+    assert len(waited) < 20
+    assert not obstacles
@@ -0,0 +1,17 @@
+import pytest
+
+from core.physics import update_speed
+
+
+@pytest.mark.parametrize(
+    "rows_direction,columns_direction,fading", [(2, 0, 0.5), (0, -2, 0.5), (1, 1, 1.5)]
+)
+def test_validation(rows_direction, columns_direction, fading):
+    with pytest.raises(ValueError):
+        update_speed(0, 0, rows_direction, columns_direction, fading=fading)
+
+
+def test_scalar_validation_may_be_skipped():
+    with pytest.raises(ValueError):
+        update_speed(0, 0, 2, 0)
+    assert update_speed(0, 0, 2, 0, validate=False) == (0.75, 0)
@@ -0,0 +1,27 @@
+from core.pool import Pool
+
+
+class Item:
+    def __init__(self, value):
+        self.reset(value)
+
+    def reset(self, value):
+        self.value = value
+
+
+def test_released_instance_is_reused():
+    pool = Pool(Item, size=1)
+    first = pool.acquire(1)
+    pool.release(first)
+    second = pool.acquire(2)
+    assert second is first
+    assert second.value == 2
+    assert (pool.created, pool.reused) == (1, 1)
+
+
+def test_pool_is_bounded():
+    pool = Pool(Item, size=1)
+    items = [pool.acquire(value) for value in range(3)]
+    for item in items:
+        pool.release(item)
+    assert pool.free == [items[0]]
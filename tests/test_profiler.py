@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from core import loop
+from core.headless import HeadlessCanvas
+from core.profiler import KindStats, Profiler, show
+from curses_tools import read_controls, key_handlers, PROFILER_KEY_CODE
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        self.now += 0.000010
+        return self.now
+
+
+async def ticker(count):
+    for _ in range(count):
+        await loop.sleep(0)
+
+
+@pytest.fixture
+def queue():
+    instance = loop.RunQueue()
+    instance.profiler = Profiler(time_func=FakeTime().time, trace_limit=4)
+    return instance
+
+
+def test_resumes_are_accounted_by_name(queue):
+    queue.spawn(ticker(2), "star")
+    queue.spawn(ticker(2), "star")
+    queue.spawn(ticker(1))
+    for tick in range(3):
+        queue.step(tick)
+    assert queue.profiler.kinds["star"].calls == 6
+    assert queue.profiler.kinds["ticker"].calls == 2
+    assert queue.profiler.kinds["star"].mean == pytest.approx(0.00001)
+    assert len(queue.profiler.trace) == 4
+    assert queue.profiler.trace[-1][3] == 2
+
+
+def test_histogram_and_percentile():
+    stats = KindStats()
+    for duration in [0.000001] * 98 + [0.001, 0.002]:
+        stats.add(duration)
+    assert stats.histogram[1] == 98
+    assert stats.percentile(0.5) == pytest.approx(0.000002)
+    assert stats.percentile(0.99) == pytest.approx(0.001024)
+    assert stats.percentile(1) == pytest.approx(0.002)
+
+
+def test_write_trace(queue, tmp_path):
+    queue.spawn(ticker(1), "star")
+    queue.step(0)
+    path = tmp_path / "trace.json"
+    queue.profiler.write_trace(path)
+    events = json.loads(path.read_text())["traceEvents"]
+    assert [event["name"] for event in events] == ["star"]
+    assert events[0]["ph"] == "X"
+    assert events[0]["dur"] == pytest.approx(10)
+
+
+def test_overlay_is_toggled_by_key(queue, monkeypatch):
+    monkeypatch.setitem(key_handlers, PROFILER_KEY_CODE, queue.profiler.toggle_overlay)
+    canvas = HeadlessCanvas(10, 60, keys=[[PROFILER_KEY_CODE]])
+    read_controls(canvas)
+    queue.spawn(show(canvas, queue.profiler), "profiler")
+    queue.step(0)
+    assert canvas.dump()[4].split()[:2] == ["task", "calls"]
+    queue.profiler.toggle_overlay()
+    queue.step(30)
+    assert canvas.dump()[4].strip() == ""
@@ -0,0 +1,81 @@
+import curses
+
+import pytest
+
+from core import loop
+from core.geometry import Geometry
+from objects import projectiles
+from objects.projectiles import Projectiles
+
+
+class RecordingCanvas:
+    def __init__(self, rows=20, columns=20):
+        self.size = rows, columns
+        self.geometry = Geometry(rows, columns)
+        self.calls = []
+
+    def getmaxyx(self):
+        return self.size
+
+    def addstr(self, row, column, text, *args):
+        self.calls.append((row, column, text))
+
+
+class Obstacles:
+    destroyed = False
+
+    def find_collision(self, row, column):
+        return 0 if round(row) == 5 else None
+
+    def destroy(self, index):
+        self.destroyed = True
+
+
+@pytest.fixture(autouse=True)
+def silent(monkeypatch):
+    monkeypatch.setattr(curses, "beep", lambda: None)
+
+
+def test_muzzle_flash_then_flight():
+    canvas = RecordingCanvas()
+    batch = Projectiles(canvas)
+    batch.fire(10, 5, rows_speed=-1)
+    for _ in range(3):
+        batch.step()
+    assert canvas.calls == [(10, 5, "*"), (10, 5, "O"), (10, 5, " "), (9, 5, "|")]
+
+
+def test_shot_leaves_canvas_and_slot_is_reused():
+    batch = Projectiles(RecordingCanvas(rows=5))
+    batch.fire(3, 5, rows_speed=-1)
+    for _ in range(6):
+        batch.step()
+    assert len(batch) == 0
+    assert len(batch.alive) == 0
+
+
+def test_shot_destroys_obstacle(monkeypatch):
+    target = Obstacles()
+    monkeypatch.setattr(projectiles, "obstacles", target)
+    batch = Projectiles(RecordingCanvas())
+    batch.fire(8, 5, rows_speed=-1)
+    batch.fire(8, 10, rows_speed=-1)
+    for _ in range(6):
+        batch.step()
+    assert target.destroyed
+    assert len(batch) == 0
+
+
+def test_task_is_suspended_while_nothing_flies():
+    queue = loop.RunQueue()
+    batch = Projectiles(RecordingCanvas(rows=5))
+    batch.start(queue)
+    queue.step(0)
+    assert batch.task.suspended
+    assert queue.next_tick(0) is None
+    batch.fire(3, 5, rows_speed=-1)
+    assert queue.next_tick(0) == 1
+    for tick in range(1, 10):
+        queue.step(tick)
+    assert len(batch) == 0
+    assert batch.task.suspended
@@ -0,0 +1,98 @@
+import pytest
+
+from core.registry import ObstacleRegistry
+from core.spatial import Grid
+
+
+@pytest.fixture
+def obstacles():
+    return ObstacleRegistry(Grid(cell_rows=4, cell_columns=4))
+
+
+def test_point_and_box_queries(obstacles):
+    first = obstacles.add(0, 0, 3, 5)
+    second = obstacles.add(10, 10, 2, 2)
+    assert obstacles.find_collision(2, 4) == first
+    assert obstacles.find_collision(3, 4) is None
+    assert obstacles.find_collision(2.5, 4.5) == first
+    assert obstacles.find_collision(8, 8, 3, 3) == second
+    assert obstacles.collisions(0, 0, 20, 20) == [first, second]
+
+
+def test_destroyed_obstacle_does_not_collide(obstacles):
+    index = obstacles.add(0, 0, 3, 3)
+    obstacles.destroy(index)
+    assert obstacles.find_collision(1, 1) is None
+
+
+def test_move(obstacles):
+    index = obstacles.add(0, 0, 3, 3)
+    obstacles.move(index, 20, 0)
+    assert obstacles.find_collision(1, 1) is None
+    assert obstacles.find_collision(21, 1) == index
+
+
+def test_removed_index_is_reused(obstacles):
+    first = obstacles.add(0, 0, 3, 3)
+    obstacles.add(10, 10, 3, 3)
+    obstacles.destroy(first)
+    obstacles.remove(first)
+    assert list(obstacles) == [1]
+    assert obstacles.add(5, 5, 1, 1) == first
+    assert obstacles.find_collision(5, 5) == first
+    assert len(obstacles) == 2
+
+
+def test_destroy_all(obstacles):
+    for row in range(3):
+        obstacles.add(row * 10, 0, 3, 3)
+    obstacles.destroy_all()
+    assert obstacles.collisions(0, 0, 30, 30) == []
+
+
+def test_destroy_drops_grid_entry(obstacles):
+    index = obstacles.add(0, 0, 3, 3)
+    obstacles.destroy(index)
+    assert index not in obstacles.grid
+    obstacles.move(index, 5, 5)
+    obstacles.remove(index)
+    assert len(obstacles.grid) == 0
+
+
+def test_counters_and_tail_is_cut_off(obstacles):
+    indexes = [obstacles.add(row, 0, 1, 1) for row in range(5)]
+    for index in reversed(indexes[1:]):
+        obstacles.remove(index)
+    assert obstacles.stats() == {"live": 1, "added": 5, "reaped": 4, "capacity": 1}
+    assert obstacles.add(0, 0, 1, 1) == 1
+
+
+def test_capacity_follows_live_obstacles(obstacles):
+    live = []
+    for number in range(1000):
+        live.append(obstacles.add(number % 40, 0, 1, 1))
+        if len(live) > 10:
+            obstacles.remove(live.pop(number % 7))
+    assert len(obstacles) == 10
+    assert len(obstacles.alive) <= 11  # peak of live obstacles
+    for index in live:
+        obstacles.remove(index)
+    assert obstacles.stats()["capacity"] == 0
+    assert len(obstacles.grid) == 0
+
+
+def test_masks_are_narrow_phase(obstacles):
+    # ring of 3x3 with the hole in the middle
+    index = obstacles.add(0, 0, 3, 3, (0b111, 0b101, 0b111))
+    assert obstacles.find_collision(1, 1) is None
+    assert obstacles.find_collision(1, 2) == index
+    assert obstacles.find_collision(1.4, 0.6) is None  # drawn at (1, 1)
+    dot = (0b1,)
+    assert obstacles.find_collision(1, 1, 1, 1, dot) is None
+    assert obstacles.find_collision(0, 1, 1, 1, dot) == index
+    # "<" shape, its box overlaps the ring before its cells do
+    ship = (0b10, 0b1, 0b10)
+    assert obstacles.find_collision(0, -2, 3, 3, ship) is None
+    assert obstacles.find_collision(0, -1, 3, 3, ship) == index
+    assert obstacles.find_collision(0, 1, 3, 3, (0b0, 0b1, 0b0)) is None
+    assert obstacles.collisions(-5, -5, 3, 3, ship) == []
@@ -0,0 +1,100 @@
+import curses
+import itertools
+import random
+
+import pytest
+
+import core.loop as loop
+import main
+import settings
+from core.headless import HeadlessCanvas
+from core.replay import Recorder, Player, pack_controls, unpack_controls
+from curses_tools import (
+    key_handlers,
+    UP_KEY_CODE,
+    LEFT_KEY_CODE,
+    RIGHT_KEY_CODE,
+    SPACE_KEY_CODE,
+)
+from state import coroutines, obstacles
+
+
+def test_every_controls_tuple_fits_into_a_byte():
+    for controls in itertools.product((-1, 0, 1), (-1, 0, 1), (False, True)):
+        value = pack_controls(*controls)
+        assert 0 <= value < 256
+        assert unpack_controls(value) == controls
+
+
+def test_record_and_replay(tmp_path):
+    path = tmp_path / "game.rec"
+    keys = [[UP_KEY_CODE], [], [LEFT_KEY_CODE, SPACE_KEY_CODE]]
+    canvas = HeadlessCanvas(20, 30, keys=keys)
+    recorder = Recorder(path, seed=42)
+    recorded = []
+    for _ in keys:
+        recorded.append(recorder.read_controls(canvas))
+        canvas.refresh()
+    recorder.close()
+
+    player = Player(path)
+    assert (player.seed, player.rows, player.columns, len(player)) == (42, 20, 30, 3)
+    replayed = [player.read_controls(None) for _ in keys]
+    assert replayed == recorded == [(-1, 0, False), (0, 0, False), (0, -1, True)]
+    assert player.read_controls(None) == (0, 0, False)
+
+
+@pytest.fixture
+def headless_game(monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", False)
+    monkeypatch.setattr(curses, "beep", lambda: None)
+    monkeypatch.setattr(loop.clock, "capped", False)
+    monkeypatch.setitem(key_handlers, curses.KEY_RESIZE, None)
+
+
+def play(window, ticks, controls):
+    """canvas and counters of the headless game"""
+    added = obstacles.added
+    try:
+        main.draw(window, ticks, controls)
+    finally:
+        for task in list(coroutines.tasks):
+            task.cancel()
+    return (
+        window.dump(),
+        loop.clock.tick,
+        loop.pacer.rendered,
+        loop.governor.stats(),
+        obstacles.added - added,
+    )
+
+
+async def resize_later(window, ticks, rows, columns):
+    await loop.sleep_ticks(ticks)
+    window.resize(rows, columns)
+
+
+def test_replay_reproduces_the_game(headless_game, tmp_path):
+    path = tmp_path / "game.rec"
+    keys = (
+        [[LEFT_KEY_CODE, SPACE_KEY_CODE]] * 30
+        + [[UP_KEY_CODE]] * 30
+        + [[RIGHT_KEY_CODE, SPACE_KEY_CODE]] * 60
+    )
+    random.seed(5)
+    window = HeadlessCanvas(20, 60, keys=keys)
+    recorder = Recorder(path, seed=5)
+    coroutines.spawn(resize_later(window, 100, 24, 70))
+    try:
+        recorded = play(window, 600, recorder.read_controls)
+    finally:
+        recorder.close()
+
+    player = Player(path)
+    assert list(player.sizes.values()) == [(24, 70)]
+    random.seed(player.seed)
+    player.window = HeadlessCanvas(player.rows, player.columns)
+    replayed = play(player.window, len(player), player.read_controls)
+    assert replayed == recorded
+    assert len(recorded[0]) == 24
+    assert recorded[1] == 600
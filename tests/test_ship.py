@@ -0,0 +1,51 @@
+import logging
+
+import pytest
+
+from core import loop
+from core.headless import HeadlessCanvas
+from objects.ship import Ship
+
+
+def move(ship, row_direction, column_direction):
+    coroutine = ship.move(row_direction, column_direction)
+    coroutine.send(None)
+    coroutine.close()
+
+
+@pytest.mark.parametrize(
+    "row,column,row_speed,column_speed,row_direction,column_direction",
+    [
+        # inertia against the controls
+        (1, 5, -2, 0, 1, 0),
+        (7, 5, 2, 0, -1, 0),
+        (4, 1, 0, -2, 0, 1),
+        (4, 17, 0, 2, 0, -1),
+        # fractional step towards the edge
+        (1.5, 5, 0, 0, -1, 0),
+        (6.5, 5, 0, 0, 1, 0),
+        (4, 1.5, 0, 0, 0, -1),
+        (4, 16.5, 0, 0, 0, 1),
+    ],
+)
+def test_ship_stops_at_every_border(
+    row, column, row_speed, column_speed, row_direction, column_direction
+):
+    canvas = HeadlessCanvas(10, 20)
+    ship = Ship(canvas, row, column, ["ab\ncd"], None, None)
+    ship.current_frame = next(ship.frames)
+    ship.row_speed, ship.column_speed = row_speed, column_speed
+    move(ship, row_direction, column_direction)
+    # the frame is 2 by 2, the border is the outer row and column
+    assert 1 <= ship.row <= 10 - 1 - 2
+    assert 1 <= ship.column <= 20 - 1 - 2
+
+
+def test_speed_is_logged_from_the_start_of_every_game(monkeypatch, caplog):
+    caplog.set_level(logging.DEBUG)
+    for _ in range(2):
+        monkeypatch.setattr(loop, "clock", loop.Clock())
+        ship = Ship(HeadlessCanvas(10, 20), 4, 5, ["ab\ncd"], None, None)
+        ship.current_frame = next(ship.frames)
+        move(ship, 0, 1)
+    assert len([text for text in caplog.messages if "row speed" in text]) == 2
@@ -0,0 +1,79 @@
+import logging
+
+import pytest
+
+import settings
+import soak
+from core import logs
+
+
+def test_fit():
+    assert soak.fit([(0, 1), (1, 3), (2, 5)]) == (pytest.approx(2), 0)
+    slope, error = soak.fit([(0, 1), (1, 2), (2, 0), (3, 1)])
+    assert slope == pytest.approx(-0.2)
+    assert error == pytest.approx(0.4243, abs=1e-4)
+    assert soak.fit([(0, 1), (1, 2)]) == (0, 0)
+    assert soak.fit([(1, 1), (1, 2), (1, 3)]) == (0, 0)
+
+
+def test_trends_skip_warmup():
+    samples = soak.Soak(10, 5)
+    hour = soak.HOUR_TICKS
+    for number in range(5):
+        samples.sample(number * hour)
+        samples.metrics["memory"][number] = 100 * (number or 5)
+        samples.metrics["coroutines"][number] = 10
+        samples.metrics["obstacles"][number] = (100, 99, 101, 99, 101)[number]
+        samples.metrics["tick_cost"][number] = 0.001
+    samples.sample(5 * hour)  # no room for it
+    assert samples.taken == 5
+    trends = samples.trends(warmup=hour)
+    assert trends["memory"] == (pytest.approx(0.4), 0)
+    assert trends["coroutines"] == (0, 0)
+    assert trends["obstacles"][0] == pytest.approx(0.004)
+    assert trends["obstacles"][1] > 0.004
+    assert soak.failed_trends(trends, soak.MAX_SLOPES) == ["memory"]
+
+
+@pytest.fixture
+def soak_settings(monkeypatch):
+    for name, value in soak.SOAK_SETTINGS.items():
+        monkeypatch.setattr(settings, name, value)
+    # soak.py sets no logging up, records captured here would add up
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def test_play_soak(soak_settings):
+    samples = soak.play_soak(300, 100, 12, 30, 1, "gunner")
+    assert samples.played == 300
+    assert samples.taken == 2
+    assert list(samples.ticks) == [100, 200, 0]
+    for name, values in samples.metrics.items():
+        # nothing is logged without the queue
+        assert values[1] > 0 or name == "log_queue"
+
+
+def test_healthy_game_passes(soak_settings):
+    samples = soak.play_soak(900, 15, 12, 30, 1, "random")
+    trends = samples.trends(warmup=300)
+    assert len(samples.fitted(300)) == 40
+    assert soak.failed_trends(trends, soak.MAX_SLOPES) == []
+
+
+def test_logs_go_through_the_queue(soak_settings, tmp_path):
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    logging.disable(logging.NOTSET)
+    path = tmp_path / "soak.log"
+    listener = logs.setup(path, logging.DEBUG)
+    try:
+        samples = soak.play_soak(300, 100, 12, 30, 1, "gunner", listener.queue)
+    finally:
+        listener.stop()
+        root.handlers, root.level = handlers, level
+    assert "DEBUG:root:Tick 240," in path.read_text()
+    listener.queue.put(None)
+    samples.sample(300)
+    assert samples.metrics["log_queue"][2] == 1
@@ -0,0 +1,30 @@
+from core.spatial import Grid
+
+
+def test_point_query_finds_only_nearby_objects():
+    grid = Grid(cell_rows=4, cell_columns=4)
+    grid.insert("near", "near value", 0, 0, 3, 3)
+    grid.insert("far", "far value", 20, 20, 3, 3)
+    assert grid.query_point(1, 1) == ["near value"]
+    assert grid.query_point(21, 22) == ["far value"]
+    assert grid.query_point(10, 10) == ()
+
+
+def test_box_query_returns_each_object_once():
+    grid = Grid(cell_rows=4, cell_columns=4)
+    grid.insert("big", "big", 0, 0, 10, 10)
+    assert grid.query_box(0, 0, 12, 12) == ["big"]
+
+
+def test_move_and_remove():
+    grid = Grid(cell_rows=4, cell_columns=4)
+    grid.insert("key", "value", 0, 0, 2, 2)
+    grid.move("key", 0.5, 0, 2, 2)
+    assert grid.query_point(1, 1) == ["value"]
+    grid.move("key", 9.5, 0, 2, 2)
+    assert grid.query_point(1, 1) == ()
+    assert grid.query_point(10, 1) == ["value"]
+    grid.remove("key")
+    grid.remove("key")
+    assert len(grid) == 0
+    assert grid.cells == {}
@@ -0,0 +1,88 @@
+import curses
+
+from core import loop
+from core.headless import HeadlessCanvas
+from objects.stars import Starfield
+
+
+def run_starfield(starfield, ticks):
+    """states of the canvas cells after every tick"""
+    queue = loop.RunQueue()
+    queue.spawn(starfield.run())
+    cells = []
+    for tick in range(ticks):
+        queue.step(tick)
+        cells.append(starfield.canvas.cell(2, 3))
+    return cells
+
+
+async def blink(canvas, row, column, symbol="*", delay=0):
+    """reference, blinking star coroutine the starfield replaces"""
+    await loop.sleep(delay)
+    while True:
+        canvas.addstr(row, column, symbol, curses.A_DIM)
+        await loop.sleep(2)
+
+        canvas.addstr(row, column, symbol)
+        await loop.sleep(0.3)
+
+        canvas.addstr(row, column, symbol, curses.A_BOLD)
+        await loop.sleep(0.5)
+
+        canvas.addstr(row, column, symbol)
+        await loop.sleep(0.3)
+
+
+def test_star_blinks_like_blink_coroutine():
+    starfield = Starfield(HeadlessCanvas(5, 10))
+    starfield.add_star(2, 3, "+", delay=0.5)
+    cells = run_starfield(starfield, 400)
+
+    canvas = HeadlessCanvas(5, 10)
+    queue = loop.RunQueue()
+    queue.spawn(blink(canvas, 2, 3, "+", delay=0.5))
+    expected = []
+    for tick in range(400):
+        queue.step(tick)
+        expected.append(canvas.cell(2, 3))
+    assert cells == expected
+    assert len(set(cells)) == 4
+
+
+def test_starfield_sleeps_until_the_next_change():
+    starfield = Starfield(HeadlessCanvas(5, 10))
+    starfield.add_star(2, 3, delay=0.5)
+    assert starfield.step() == 30
+    starfield.tick = 30
+    assert starfield.step() == 120
+
+
+def test_parallax_layer_scrolls_and_wraps():
+    canvas = HeadlessCanvas(5, 10)
+    starfield = Starfield(canvas)
+    starfield.add_layer([(3, 3)], period=10)
+    assert canvas.cell(3, 3) == (".", curses.A_DIM)
+    cells = []
+    queue = loop.RunQueue()
+    queue.spawn(starfield.run())
+    for tick in range(31):
+        queue.step(tick)
+        cells.append([row for row in range(5) if canvas.cell(row, 3)[0] == "."])
+    assert cells[9] == [3]
+    assert cells[10] == [1]
+    assert cells[20] == [2]
+    assert cells[30] == [3]
+
+
+def test_resize_keeps_delayed_star_dark():
+    canvas = HeadlessCanvas(12, 22)
+    starfield = Starfield(canvas)
+    starfield.add_star(3, 4, "+", delay=0.5)
+    starfield.add_star(5, 6, ":")
+    queue = loop.RunQueue()
+    queue.spawn(starfield.run())
+    for tick in range(3):
+        queue.step(tick)
+    canvas.resize(12, 23)
+    assert canvas.cell(3, 4) == (" ", 0)
+    assert canvas.cell(5, 6) == (":", curses.A_DIM)